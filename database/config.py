@@ -0,0 +1,53 @@
+import os
+from dataclasses import dataclass
+from dotenv import load_dotenv
+
+
+@dataclass(frozen=True, slots=True)
+class Config:
+    """Database settings read from .env / the process environment"""
+    db_username: str
+    db_password: str
+    db_host:     str
+    db_port:     int
+    db_name:     str
+    sql_echo:    bool = False
+    bulk_upsert: bool = True
+
+
+_CONFIG: Config | None = None
+_LOADED = False
+
+
+def _load_once():
+    """Read .env into os.environ the first time only"""
+    global _LOADED
+    if not _LOADED:
+        load_dotenv(".env")
+        _LOADED = True
+
+
+def _env(name: str, default, cast=str):
+    value = os.environ.get(name)
+    return cast(default if value is None else value)
+
+
+def _flag(value) -> bool:
+    return str(value).strip().lower() in ('1', 'true', 'yes', 'on')
+
+
+def get_config() -> Config:
+    """Parse .env once and return the memoized Config"""
+    global _CONFIG
+    if _CONFIG is None:
+        _load_once()
+        _CONFIG = Config(
+            db_username = _env('DB_USERNAME', 'root'),
+            db_password = _env('DB_PASSWORD', 'root'),
+            db_host     = _env('DB_HOST', 'localhost'),
+            db_port     = _env('DB_PORT', 3306, int),
+            db_name     = _env('DB_NAME', 'tally_db'),
+            sql_echo    = _env('SQL_ECHO', False, _flag),
+            bulk_upsert = _env('BULK_UPSERT', True, _flag),
+        )
+    return _CONFIG
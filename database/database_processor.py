@@ -1,7 +1,16 @@
+from contextlib import contextmanager
 from datetime import datetime
+from decimal import Decimal
+from functools import lru_cache
+from itertools import islice
+from operator import attrgetter, itemgetter
+from sqlalchemy import and_, or_, tuple_, bindparam, case, func, inspect
+from sqlalchemy.dialects.mysql import insert as mysql_insert
 from sqlalchemy.orm import sessionmaker
+import logging
 import threading
 
+from database.config import get_config
 from database.models.company import Company
 from database.models.sync_state import SyncState
 from database.models.ledger import Ledger
@@ -10,7 +19,6 @@ from database.models.inventory_voucher import SalesVoucher, PurchaseVoucher, Cre
 from database.models.ledger_voucher import ReceiptVoucher, PaymentVoucher, JournalVoucher, ContraVoucher
 from database.models.trial_balance import TrialBalance
 
-import pandas as pd
 from logging_config import logger
 
 # ── Per-company SyncState write locks ────────────────────────────────────────
@@ -26,259 +34,581 @@ def _get_db_company_lock(company_name: str) -> threading.Lock:
             _DB_COMPANY_LOCKS[company_name] = threading.Lock()
         return _DB_COMPANY_LOCKS[company_name]
 
+@lru_cache(maxsize=None)
+def _session_factory(engine):
+    # One sessionmaker per engine; the GUI builds a new engine on reconnect.
+    return sessionmaker(bind=engine, expire_on_commit=False, autoflush=False)
+
 def _get_session(engine):
-    return sessionmaker(bind=engine)()
+    return _session_factory(engine)()
+
+@contextmanager
+def batch_session(engine):
+    """One session / one transaction for a logical unit of upserts."""
+    db = _get_session(engine)
+    try:
+        yield db
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+# ── Bulk lookup helpers ───────────────────────────────────────────────────────
+# Upserts resolve existing rows with one chunked tuple-IN query per batch
+# instead of one SELECT per row.
+_PRELOAD_CHUNK = 1000
+
+def _fold(value):
+    """
+    Approximate the utf8mb4_unicode_ci comparison MySQL applies to key
+    columns: strings match regardless of case and trailing spaces.
+    """
+    return value.casefold().rstrip() if isinstance(value, str) else value
+
+def _fold_key(key):
+    return tuple(_fold(v) for v in key)
+
+def _preload_existing(db, model_class, key_fields, keys, columns=None):
+    """
+    Return {folded composite key: record} for every existing row matching *keys*.
+
+    The database matches *keys* under its collation, so look records up with
+    _fold_key(key) rather than the raw tuple.  With *columns* only the key
+    fields and those columns are selected, and the records are plain result
+    rows instead of ORM instances.
+    """
+    cols     = tuple(getattr(model_class, f) for f in key_fields)
+    key_cols = tuple_(*cols)
+    if columns is None:
+        query = db.query(model_class)
+    else:
+        table = model_class.__table__
+        query = db.query(*(table.c[f] for f in dict.fromkeys(key_fields + columns)))
+
+    # A tuple IN never matches a NULL key part, so keys holding a None are
+    # looked up separately with explicit IS NULL comparisons.
+    full_keys, null_keys = [], []
+    for key in keys:
+        (null_keys if None in key else full_keys).append(key)
+
+    def null_match(key):
+        return and_(*(col.is_(None) if val is None else col == val for col, val in zip(cols, key)))
+
+    existing = {}
+    with db.no_autoflush:
+        for start in range(0, len(full_keys), _PRELOAD_CHUNK):
+            chunk = full_keys[start:start + _PRELOAD_CHUNK]
+            for record in query.filter(key_cols.in_(chunk)):
+                existing[_fold_key(getattr(record, f) for f in key_fields)] = record
+        for start in range(0, len(null_keys), _PRELOAD_CHUNK):
+            chunk = null_keys[start:start + _PRELOAD_CHUNK]
+            for record in query.filter(or_(*(null_match(key) for key in chunk))):
+                existing[_fold_key(getattr(record, f) for f in key_fields)] = record
+    return existing
+
+def _preload_for_staging(db, model_class, key_fields, keys):
+    """
+    _preload_existing narrowed to what _stage_upserts reads (id, alter_id).
+
+    Under DEBUG the full instances are loaded so _log_changes can diff them.
+    """
+    columns = None if logger.isEnabledFor(logging.DEBUG) else ('id', 'alter_id')
+    return _preload_existing(db, model_class, key_fields, keys, columns)
+
+def _mark_deleted(db, model_class, rows):
+    """
+    Flag every stored line of the deleted vouchers in *rows*.
+
+    Rows are grouped by (company_name, change_status) and each group is one
+    UPDATE ... WHERE guid IN (...) per chunk; the per-voucher alter_id is set
+    through a CASE on guid.
+    """
+    if not rows:
+        return 0
+    table  = model_class.__table__
+    groups = {}
+    for row in rows:
+        group = groups.setdefault((row['company_name'], row.get('change_status', 'Deleted')), {})
+        group[row['guid']] = row.get('alter_id')
+
+    db.flush()
+    deleted = 0
+    for (company_name, change_status), alter_ids in groups.items():
+        guids = list(alter_ids)
+        for start in range(0, len(guids), _PRELOAD_CHUNK):
+            chunk    = guids[start:start + _PRELOAD_CHUNK]
+            new_ids  = {g: alter_ids[g] for g in chunk if alter_ids[g] is not None}
+            alter_id = case(new_ids, value=table.c.guid, else_=table.c.alter_id) if new_ids else table.c.alter_id
+            result   = db.execute(
+                table.update()
+                .where(table.c.company_name == company_name, table.c.guid.in_(chunk))
+                .values(is_deleted='Yes', change_status=change_status, alter_id=alter_id)
+            )
+            deleted += max(result.rowcount, 0)
+    return deleted
+
+# ── MySQL bulk upsert ─────────────────────────────────────────────────────────
+# With a unique key on the lookup columns MySQL can resolve a whole batch in
+# one INSERT ... ON DUPLICATE KEY UPDATE.  Every column only takes the incoming
+# value when its alter_id is newer, so "newest alter_id wins" is kept in SQL.
+_UPSERT_CHUNK = 500
+
+@lru_cache(maxsize=None)
+def _has_unique_key(engine, table_name, key_fields):
+    wanted = set(key_fields)
+    insp   = inspect(engine)
+    return (
+        any(ix['unique'] and set(ix['column_names']) == wanted for ix in insp.get_indexes(table_name))
+        or any(set(uc['column_names']) == wanted for uc in insp.get_unique_constraints(table_name))
+    )
+
+def _is_mysql(db):
+    return db.get_bind().dialect.name == 'mysql'
+
+def _bulk_upsert_enabled(db, model_class, key_fields):
+    """
+    True when the batch can go through _mysql_upsert: BULK_UPSERT is on, the
+    backend is MySQL and *key_fields* carry a unique key.
+    """
+    if not get_config().bulk_upsert or not _is_mysql(db):
+        return False
+    return _has_unique_key(db.get_bind().engine, model_class.__tablename__, tuple(sorted(key_fields)))
+
+def _mysql_upsert(db, model_class, key_fields, keyed_rows, update_fields, label, to_mapping):
+    """
+    Write unique (key, row) pairs with one INSERT ... ON DUPLICATE KEY UPDATE
+    per chunk and return (inserted, updated, unchanged).
+
+    MySQL reports 2 affected rows for an update and 1 for both an insert and
+    an untouched duplicate (SQLAlchemy always sets CLIENT.FOUND_ROWS), so each
+    chunk first preloads which of its keys are already stored to tell those
+    two apart.  Under DEBUG that preload carries whole instances and the rows
+    with a newer alter_id go through _log_changes.
+    """
+    table = model_class.__table__
+    debug = logger.isEnabledFor(logging.DEBUG)
+    inserted = updated = unchanged = 0
+    for start in range(0, len(keyed_rows), _UPSERT_CHUNK):
+        chunk    = keyed_rows[start:start + _UPSERT_CHUNK]
+        existing = _preload_for_staging(db, model_class, key_fields, {key for key, _ in chunk})
+        if debug:
+            for key, row in chunk:
+                record = existing.get(_fold_key(key))
+                if record is not None and int(row.get('alter_id', 0)) > int(record.alter_id or 0):
+                    _log_changes(label, record, update_fields, row)
+
+        stmt  = mysql_insert(table).values([to_mapping(row) for _, row in chunk])
+        newer = stmt.inserted.alter_id > table.c.alter_id
+        # alter_id must be assigned last: MySQL evaluates the SET list left to
+        # right and later IF()s would otherwise compare against the new value.
+        assignments = [
+            (f, func.if_(newer, stmt.inserted[f], table.c[f]))
+            for f in update_fields if f != 'alter_id'
+        ]
+        assignments.append(('updated_at', func.if_(newer, func.now(), table.c.updated_at)))
+        assignments.append(('alter_id', func.greatest(stmt.inserted.alter_id, table.c.alter_id)))
+        result = db.execute(stmt.on_duplicate_key_update(assignments))
+
+        chunk_updated = max(result.rowcount - len(chunk), 0)
+        inserted  += len(chunk) - len(existing)
+        updated   += chunk_updated
+        unchanged += max(len(existing) - chunk_updated, 0)
+    return inserted, updated, unchanged
+
+def _split_alt_key_conflicts(db, model_class, key_fields, alt_key_fields, keyed_rows):
+    """
+    Split unique (key, row) pairs into (clean, conflicting) on a second
+    unique key of the table.
+
+    ON DUPLICATE KEY UPDATE fires on whichever unique key collides, so a row
+    whose *alt_key_fields* value is stored under a different key, or is shared
+    by several keys in the batch, would overwrite that other row.  Those rows
+    take the staged path, where the INSERT or UPDATE raises IntegrityError.
+    """
+    def alt_of(row):
+        return tuple(row.get(f) for f in alt_key_fields)
+
+    stored = _preload_existing(
+        db, model_class, alt_key_fields, {alt_of(row) for _, row in keyed_rows}, key_fields,
+    )
+    owners = {}
+    for alt, record in stored.items():
+        owners.setdefault(alt, set()).add(_fold_key(getattr(record, f) for f in key_fields))
+    for key, row in keyed_rows:
+        owners.setdefault(_fold_key(alt_of(row)), set()).add(_fold_key(key))
+
+    clean, conflicting = [], []
+    for key, row in keyed_rows:
+        target = clean if len(owners[_fold_key(alt_of(row))]) == 1 else conflicting
+        target.append((key, row))
+    return clean, conflicting
+
+def _upsert_keyed(db, model_class, key_fields, keyed_rows, update_fields, label, to_mapping,
+                  alt_key_fields=None):
+    """
+    Upsert unique (key, row) pairs and return (inserted, updated, unchanged).
+
+    Uses _mysql_upsert when _bulk_upsert_enabled allows it.  A unique index
+    never collides on NULL, so keys with a None part always take the
+    preload-and-stage path, as does everything else on other backends.
+    *alt_key_fields* names a second unique key of the table; rows clashing
+    on it are staged too (see _split_alt_key_conflicts).
+    """
+    staged = keyed_rows
+    inserted = updated = unchanged = 0
+    if _bulk_upsert_enabled(db, model_class, key_fields):
+        bulk   = [pair for pair in keyed_rows if None not in pair[0]]
+        staged = [pair for pair in keyed_rows if None in pair[0]]
+        if alt_key_fields:
+            bulk, conflicting = _split_alt_key_conflicts(db, model_class, key_fields, alt_key_fields, bulk)
+            staged += conflicting
+        inserted, updated, unchanged = _mysql_upsert(
+            db, model_class, key_fields, bulk, update_fields, label, to_mapping,
+        )
+    if staged:
+        existing_map = _preload_for_staging(db, model_class, key_fields, {key for key, _ in staged})
+        to_insert, to_update, s_updated, s_unchanged = _stage_upserts(
+            staged, existing_map, update_fields, label, to_mapping,
+        )
+        _flush_staged(db, model_class, to_insert, to_update)
+        inserted  += len(to_insert)
+        updated   += s_updated
+        unchanged += s_unchanged
+    return inserted, updated, unchanged
 
 def _log_result(label, inserted, updated, unchanged, skipped, deleted=0):
     logger.info(
-        f"{label} completed | "
-        f"Inserted: {inserted} | "
-        f"Updated: {updated} | "
-        f"Unchanged: {unchanged} | "
-        f"Deleted: {deleted} | "
-        f"Skipped: {skipped}"
+        "%s completed | Inserted: %d | Updated: %d | Unchanged: %d | Deleted: %d | Skipped: %d",
+        label, inserted, updated, unchanged, deleted, skipped,
     )
 
+_NUMBER_TYPES = (int, float, Decimal)
+
+def _differ(old_val, new_val):
+    """
+    Typed inequality for change logging.  Numbers compare by value (Decimal
+    vs float included); mixed non-numeric types such as a Date column against
+    an ISO string from the parser fall back to their string forms.
+    """
+    if old_val is None or new_val is None:
+        return old_val is not new_val
+    if isinstance(old_val, _NUMBER_TYPES) and isinstance(new_val, _NUMBER_TYPES):
+        return abs(float(old_val) - float(new_val)) > 1e-9
+    if type(old_val) is type(new_val):
+        return old_val != new_val
+    return str(old_val) != str(new_val)
+
+@lru_cache(maxsize=None)
+def _field_getters(update_fields):
+    return tuple((field, attrgetter(field)) for field in update_fields)
+
 def _log_changes(label, existing, update_fields, new_row):
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     changes = []
-    for field in update_fields:
-        old_val = getattr(existing, field, None)
+    for field, getter in _field_getters(tuple(update_fields)):
+        old_val = getter(existing)
         new_val = new_row.get(field)
-        if str(old_val) != str(new_val):
+        if _differ(old_val, new_val):
             changes.append(f"  {field}: [{old_val}] → [{new_val}]")
     if changes:
         logger.debug(
-            f"{label} | guid={getattr(existing, 'guid', '?')} | "
-            f"{len(changes)} field(s) changed:\n" + "\n".join(changes)
+            "%s | guid=%s | %d field(s) changed:\n%s",
+            label, getattr(existing, 'guid', '?'), len(changes), "\n".join(changes),
         )
 
+def _as_date(value):
+    """Coerce Tally's YYYYMMDD strings to date so they match values read back from Date columns."""
+    if isinstance(value, str) and value:
+        try:
+            return datetime.strptime(value, '%Y%m%d').date()
+        except ValueError:
+            return value
+    return value
+
 def _t(value, max_len):
     if value is None:
         return None
-    value = str(value).strip()
-    if len(value) > max_len:
-        logger.debug(f"Truncating value of length {len(value)} to {max_len}: {value[:30]}...")
-        return value[:max_len]
-    return value
-
-def _upsert_inventory_voucher_in_session(rows, model_class, db):
-    inserted = updated = unchanged = skipped = deleted = 0
+    value = (value if type(value) is str else str(value)).strip()
+    if len(value) <= max_len:
+        return value
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Truncating value of length %d to %d: %s...", len(value), max_len, value[:30])
+    return value[:max_len]
+
+def _dedupe_newest(keyed_rows):
+    """
+    Fold (key, row) pairs so each key appears once (compared with _fold_key,
+    as the database would), keeping the copy with the newest alter_id (the
+    first copy on a tie).
 
-    update_fields = [
-        'date', 'voucher_number', 'reference', 'voucher_type',
-        'party_name', 'gst_number', 'e_invoice_number', 'eway_bill',
-        'item_name', 'quantity', 'unit', 'alt_qty', 'alt_unit',
-        'batch_no', 'mfg_date', 'exp_date', 'hsn_code', 'gst_rate',
-        'rate', 'amount', 'discount',
-        'cgst_amt', 'sgst_amt', 'igst_amt',
-        'freight_amt', 'dca_amt', 'cf_amt', 'other_amt', 'total_amt',
-        'currency', 'exchange_rate', 'narration',
-        'alter_id', 'master_id', 'change_status', 'is_deleted',
-    ]
+    Returns (pairs, superseded) where superseded counts the dropped copies.
+    """
+    newest = {}
+    for key, row in keyed_rows:
+        folded = _fold_key(key)
+        kept   = newest.get(folded)
+        if kept is None or int(row.get('alter_id', 0)) > int(kept[1].get('alter_id', 0)):
+            newest[folded] = (key, row)
+    return list(newest.values()), len(keyed_rows) - len(newest)
+
+def _stage_upserts(keyed_rows, existing_map, update_fields, label, to_mapping):
+    """
+    Split (key, row) pairs into insert and update mappings for the bulk APIs.
 
-    for row in rows:
+    Keys must already be unique (see _dedupe_newest).  Update mappings carry
+    the primary key of the stored record.
+    """
+    to_insert, to_update = [], []
+    updated = unchanged = 0
+
+    for key, row in keyed_rows:
+        existing = existing_map.get(_fold_key(key))
+        if existing is None:
+            to_insert.append(to_mapping(row))
+        elif int(row.get('alter_id', 0)) > int(existing.alter_id or 0):
+            _log_changes(label, existing, update_fields, row)
+            to_update.append({'id': existing.id, **{f: row.get(f) for f in update_fields}})
+            updated += 1
+        else:
+            unchanged += 1
+
+    return to_insert, to_update, updated, unchanged
+
+def _flush_staged(db, model_class, to_insert, to_update):
+    if to_insert:
+        db.bulk_insert_mappings(model_class, to_insert)
+    if to_update:
+        db.bulk_update_mappings(model_class, to_update)
+
+_INV_VOUCHER_INSERT_SPEC = (
+    ('company_name',     None),
+    ('date',             None),
+    ('voucher_number',   None),
+    ('reference',        None),
+    ('voucher_type',     None),
+    ('party_name',       None),
+    ('gst_number',       None),
+    ('e_invoice_number', None),
+    ('eway_bill',        None),
+    ('item_name',        None),
+    ('quantity',         0.0),
+    ('unit',             None),
+    ('alt_qty',          0.0),
+    ('alt_unit',         None),
+    ('batch_no',         None),
+    ('mfg_date',         None),
+    ('exp_date',         None),
+    ('hsn_code',         None),
+    ('gst_rate',         0.0),
+    ('rate',             0.0),
+    ('amount',           0.0),
+    ('discount',         0.0),
+    ('cgst_amt',         0.0),
+    ('sgst_amt',         0.0),
+    ('igst_amt',         0.0),
+    ('freight_amt',      0.0),
+    ('dca_amt',          0.0),
+    ('cf_amt',           0.0),
+    ('other_amt',        0.0),
+    ('total_amt',        0.0),
+    ('currency',         'INR'),
+    ('exchange_rate',    1.0),
+    ('narration',        None),
+    ('guid',             None),
+    ('alter_id',         0),
+    ('master_id',        None),
+    ('change_status',    None),
+    ('is_deleted',       'No'),
+)
+
+def _inventory_voucher_mapping(row):
+    return {k: row.get(k, d) for k, d in _INV_VOUCHER_INSERT_SPEC}
+
+_LEDGER_VOUCHER_INSERT_SPEC = (
+    ('company_name',   None),
+    ('date',           None),
+    ('voucher_type',   None),
+    ('voucher_number', None),
+    ('reference',      None),
+    ('ledger_name',    None),
+    ('amount',         0.0),
+    ('amount_type',    None),
+    ('currency',       'INR'),
+    ('exchange_rate',  1.0),
+    ('narration',      None),
+    ('guid',           None),
+    ('alter_id',       0),
+    ('master_id',      None),
+    ('change_status',  None),
+    ('is_deleted',     'No'),
+)
+
+def _ledger_voucher_mapping(row):
+    return {k: row.get(k, d) for k, d in _LEDGER_VOUCHER_INSERT_SPEC}
+
+_INV_VOUCHER_UPDATE_FIELDS = (
+    'date', 'voucher_number', 'reference', 'voucher_type',
+    'party_name', 'gst_number', 'e_invoice_number', 'eway_bill',
+    'item_name', 'quantity', 'unit', 'alt_qty', 'alt_unit',
+    'batch_no', 'mfg_date', 'exp_date', 'hsn_code', 'gst_rate',
+    'rate', 'amount', 'discount',
+    'cgst_amt', 'sgst_amt', 'igst_amt',
+    'freight_amt', 'dca_amt', 'cf_amt', 'other_amt', 'total_amt',
+    'currency', 'exchange_rate', 'narration',
+    'alter_id', 'master_id', 'change_status', 'is_deleted',
+)
+
+_LEDGER_VOUCHER_UPDATE_FIELDS = (
+    'date', 'voucher_type', 'voucher_number', 'reference',
+    'amount', 'amount_type', 'currency', 'exchange_rate',
+    'narration', 'alter_id', 'master_id', 'change_status', 'is_deleted',
+)
+
+def _split_voucher_rows(rows):
+    """
+    Sort voucher rows into (skipped, live, deleted, revived).
+
+    A deletion covers the whole voucher (guid, company_name).  A live row
+    newer than its voucher's latest deletion (higher alter_id, or equal and
+    later in the batch) re-adds that line after the delete, so it is returned
+    in *revived* and written once the deletions are applied.  Older live rows
+    are written first and end up deleted with the rest of the voucher, as if
+    the batch were applied in order.
+    """
+    skipped = 0
+    live, deleted = [], []
+    latest_delete = {}
+    for pos, row in enumerate(rows):
         if not row.get('guid'):
             skipped += 1
-            continue
-
-        is_deleted_flag = row.get('is_deleted', 'No')
-
-        if is_deleted_flag == 'Yes':
-            affected = db.query(model_class).filter_by(
-                guid         = row['guid'],
-                company_name = row['company_name'],
-            ).all()
-            for record in affected:
-                record.is_deleted    = 'Yes'
-                record.change_status = row.get('change_status', 'Deleted')
-                record.alter_id      = row.get('alter_id', record.alter_id)
-            deleted += len(affected)
-            continue
-
-        existing = db.query(model_class).filter_by(
-            guid         = row['guid'],
-            company_name = row['company_name'],
-            item_name    = row.get('item_name', ''),
-            batch_no     = row.get('batch_no', ''),
-        ).first()
-
-        if existing:
-            if int(row.get('alter_id', 0)) > int(existing.alter_id or 0):
-                _log_changes("inventory_voucher UPDATE", existing, update_fields, row)
-                for field in update_fields:
-                    setattr(existing, field, row.get(field))
-                updated += 1
-            else:
-                unchanged += 1
+        elif row.get('is_deleted', 'No') == 'Yes':
+            deleted.append(row)
+            voucher = _fold_key((row['guid'], row['company_name']))
+            stamp   = (int(row.get('alter_id') or 0), pos)
+            latest_delete[voucher] = max(latest_delete.get(voucher, stamp), stamp)
         else:
-            db.add(model_class(
-                company_name     = row.get('company_name'),
-                date             = row.get('date'),
-                voucher_number   = row.get('voucher_number'),
-                reference        = row.get('reference'),
-                voucher_type     = row.get('voucher_type'),
-                party_name       = row.get('party_name'),
-                gst_number       = row.get('gst_number'),
-                e_invoice_number = row.get('e_invoice_number'),
-                eway_bill        = row.get('eway_bill'),
-                item_name        = row.get('item_name'),
-                quantity         = row.get('quantity', 0.0),
-                unit             = row.get('unit'),
-                alt_qty          = row.get('alt_qty', 0.0),
-                alt_unit         = row.get('alt_unit'),
-                batch_no         = row.get('batch_no'),
-                mfg_date         = row.get('mfg_date'),
-                exp_date         = row.get('exp_date'),
-                hsn_code         = row.get('hsn_code'),
-                gst_rate         = row.get('gst_rate', 0.0),
-                rate             = row.get('rate', 0.0),
-                amount           = row.get('amount', 0.0),
-                discount         = row.get('discount', 0.0),
-                cgst_amt         = row.get('cgst_amt', 0.0),
-                sgst_amt         = row.get('sgst_amt', 0.0),
-                igst_amt         = row.get('igst_amt', 0.0),
-                freight_amt      = row.get('freight_amt', 0.0),
-                dca_amt          = row.get('dca_amt', 0.0),
-                cf_amt           = row.get('cf_amt', 0.0),
-                other_amt        = row.get('other_amt', 0.0),
-                total_amt        = row.get('total_amt', 0.0),
-                currency         = row.get('currency', 'INR'),
-                exchange_rate    = row.get('exchange_rate', 1.0),
-                narration        = row.get('narration'),
-                guid             = row.get('guid'),
-                alter_id         = row.get('alter_id', 0),
-                master_id        = row.get('master_id'),
-                change_status    = row.get('change_status'),
-                is_deleted       = row.get('is_deleted', 'No'),
-            ))
-            inserted += 1
+            live.append((pos, row))
 
+    before, revived = [], []
+    for pos, row in live:
+        cutoff = latest_delete.get(_fold_key((row['guid'], row['company_name'])))
+        if cutoff is not None and (int(row.get('alter_id', 0)), pos) > cutoff:
+            revived.append(row)
+        else:
+            before.append(row)
+    return skipped, before, deleted, revived
+
+def _upsert_voucher_rows(rows, model_class, db, key_fields, update_fields, label, to_mapping):
+    """Upsert voucher lines and apply voucher deletions; returns the five counters."""
+    skipped, live_rows, deleted_rows, revived_rows = _split_voucher_rows(rows)
+
+    def upsert(batch):
+        keyed_rows, superseded = _dedupe_newest([
+            (tuple(row.get(f, '') for f in key_fields), row) for row in batch
+        ])
+        inserted, updated, unchanged = _upsert_keyed(
+            db, model_class, key_fields, keyed_rows, update_fields, label, to_mapping,
+        )
+        return inserted, updated, unchanged + superseded
+
+    inserted, updated, unchanged = upsert(live_rows)
+    deleted = _mark_deleted(db, model_class, deleted_rows)
+    if revived_rows:
+        r_inserted, r_updated, r_unchanged = upsert(revived_rows)
+        inserted  += r_inserted
+        updated   += r_updated
+        unchanged += r_unchanged
     return inserted, updated, unchanged, skipped, deleted
 
-def _upsert_ledger_voucher_in_session(rows, model_class, db):
-    inserted = updated = unchanged = skipped = deleted = 0
-
-    update_fields = [
-        'date', 'voucher_type', 'voucher_number', 'reference',
-        'amount', 'amount_type', 'currency', 'exchange_rate',
-        'narration', 'alter_id', 'master_id', 'change_status', 'is_deleted',
-    ]
-
-    for row in rows:
-        if not row.get('guid'):
-            skipped += 1
-            continue
-
-        is_deleted_flag = row.get('is_deleted', 'No')
-
-        if is_deleted_flag == 'Yes':
-            affected = db.query(model_class).filter_by(
-                guid         = row['guid'],
-                company_name = row['company_name'],
-            ).all()
-            for record in affected:
-                record.is_deleted    = 'Yes'
-                record.change_status = row.get('change_status', 'Deleted')
-                record.alter_id      = row.get('alter_id', record.alter_id)
-            deleted += len(affected)
-            continue
-
-        existing = db.query(model_class).filter_by(
-            guid         = row['guid'],
-            company_name = row['company_name'],
-            ledger_name  = row.get('ledger_name', ''),
-        ).first()
-
-        if existing:
-            if int(row.get('alter_id', 0)) > int(existing.alter_id or 0):
-                _log_changes("ledger_voucher UPDATE", existing, update_fields, row)
-                for field in update_fields:
-                    setattr(existing, field, row.get(field))
-                updated += 1
-            else:
-                unchanged += 1
-        else:
-            db.add(model_class(
-                company_name   = row.get('company_name'),
-                date           = row.get('date'),
-                voucher_type   = row.get('voucher_type'),
-                voucher_number = row.get('voucher_number'),
-                reference      = row.get('reference'),
-                ledger_name    = row.get('ledger_name'),
-                amount         = row.get('amount', 0.0),
-                amount_type    = row.get('amount_type'),
-                currency       = row.get('currency', 'INR'),
-                exchange_rate  = row.get('exchange_rate', 1.0),
-                narration      = row.get('narration'),
-                guid           = row.get('guid'),
-                alter_id       = row.get('alter_id', 0),
-                master_id      = row.get('master_id'),
-                change_status  = row.get('change_status'),
-                is_deleted     = row.get('is_deleted', 'No'),
-            ))
-            inserted += 1
+def _upsert_inventory_voucher_in_session(rows, model_class, db):
+    return _upsert_voucher_rows(
+        rows, model_class, db,
+        ('guid', 'company_name', 'item_name', 'batch_no'), _INV_VOUCHER_UPDATE_FIELDS,
+        "inventory_voucher UPDATE", _inventory_voucher_mapping,
+    )
 
-    return inserted, updated, unchanged, skipped, deleted
+def _upsert_ledger_voucher_in_session(rows, model_class, db):
+    return _upsert_voucher_rows(
+        rows, model_class, db,
+        ('guid', 'company_name', 'ledger_name'), _LEDGER_VOUCHER_UPDATE_FIELDS,
+        "ledger_voucher UPDATE", _ledger_voucher_mapping,
+    )
 
 def upsert_and_advance_month(rows, model_class, upsert_fn, company_name, voucher_type, month_str, engine, chunk_max_alter_id=0):
     """
     Upsert voucher rows for one chunk then atomically advance SyncState.
 
-    The SyncState update is protected by a per-company lock so that two
-    voucher worker threads for the same company cannot overwrite each other's
-    last_synced_month / last_alter_id.  The (slow) voucher upsert itself runs
-    outside the lock so other voucher types are not blocked.
+    Both writes share one session and commit together.  The SyncState update
+    is protected by a per-company lock so that two voucher worker threads for
+    the same company cannot overwrite each other's last_synced_month /
+    last_alter_id.  The (slow) voucher upsert itself runs outside the lock so
+    other voucher types are not blocked.
     """
     db = _get_session(engine)
     try:
         inserted, updated, unchanged, skipped, deleted = upsert_fn(rows, model_class, db)
-        db.commit()
     except Exception:
         db.rollback()
         logger.exception(f"[{company_name}] [{voucher_type}] Month {month_str} voucher upsert ROLLED BACK")
         db.close()
         raise
-    else:
-        db.close()
 
-    # Now update SyncState in a separate session, protected by the company lock.
     lock = _get_db_company_lock(company_name)
     with lock:
-        db2 = _get_session(engine)
         try:
-            state = db2.query(SyncState).filter_by(
-                company_name = company_name,
-                voucher_type = voucher_type,
-            ).first()
-
-            if state:
-                state.last_synced_month = month_str
-                state.last_sync_time    = datetime.utcnow()
-                if chunk_max_alter_id > (state.last_alter_id or 0):
-                    state.last_alter_id = chunk_max_alter_id
-            else:
-                db2.add(SyncState(
+            if _is_mysql(db):
+                table = SyncState.__table__
+                stmt  = mysql_insert(table).values(
                     company_name      = company_name,
                     voucher_type      = voucher_type,
                     last_alter_id     = chunk_max_alter_id,
                     is_initial_done   = False,
                     last_synced_month = month_str,
                     last_sync_time    = datetime.utcnow(),
+                )
+                db.execute(stmt.on_duplicate_key_update(
+                    last_synced_month = stmt.inserted.last_synced_month,
+                    last_sync_time    = stmt.inserted.last_sync_time,
+                    last_alter_id     = func.greatest(table.c.last_alter_id, stmt.inserted.last_alter_id),
+                    updated_at        = func.now(),
                 ))
-
-            db2.commit()
+            else:
+                state = db.query(SyncState).filter_by(
+                    company_name = company_name,
+                    voucher_type = voucher_type,
+                ).first()
+
+                if state:
+                    state.last_synced_month = month_str
+                    state.last_sync_time    = datetime.utcnow()
+                    if chunk_max_alter_id > (state.last_alter_id or 0):
+                        state.last_alter_id = chunk_max_alter_id
+                else:
+                    db.add(SyncState(
+                        company_name      = company_name,
+                        voucher_type      = voucher_type,
+                        last_alter_id     = chunk_max_alter_id,
+                        is_initial_done   = False,
+                        last_synced_month = month_str,
+                        last_sync_time    = datetime.utcnow(),
+                    ))
+
+            db.commit()
             logger.info(
-                f"[{company_name}] [{voucher_type}] Month {month_str} committed | "
-                f"ins={inserted} upd={updated} unch={unchanged} del={deleted} skip={skipped}"
+                "[%s] [%s] Month %s committed | ins=%d upd=%d unch=%d del=%d skip=%d",
+                company_name, voucher_type, month_str, inserted, updated, unchanged, deleted, skipped,
             )
             return inserted, updated, unchanged, skipped, deleted
 
         except Exception:
-            db2.rollback()
-            logger.exception(f"[{company_name}] [{voucher_type}] Month {month_str} SyncState ROLLED BACK")
+            db.rollback()
+            logger.exception(f"[{company_name}] [{voucher_type}] Month {month_str} SyncState write ROLLED BACK (chunk not committed)")
             raise
         finally:
-            db2.close()
+            db.close()
 
 def get_sync_state(company_name, voucher_type, engine):
     db = _get_session(engine)
@@ -290,9 +620,36 @@ def get_sync_state(company_name, voucher_type, engine):
     finally:
         db.close()
 
-def update_sync_state(company_name, voucher_type, last_alter_id, engine, last_synced_month=None, is_initial_done=True):
+def get_sync_states(company_name, engine):
+    """Every SyncState row of *company_name* keyed by voucher_type, in one SELECT."""
     db = _get_session(engine)
     try:
+        return {
+            state.voucher_type: state
+            for state in db.query(SyncState).filter_by(company_name=company_name)
+        }
+    finally:
+        db.close()
+
+def _write_sync_state(db, company_name, voucher_type, last_alter_id, last_synced_month, is_initial_done):
+    if _is_mysql(db):
+        table = SyncState.__table__
+        stmt  = mysql_insert(table).values(
+            company_name      = company_name,
+            voucher_type      = voucher_type,
+            last_alter_id     = last_alter_id,
+            is_initial_done   = is_initial_done,
+            last_synced_month = last_synced_month,
+            last_sync_time    = datetime.utcnow(),
+        )
+        db.execute(stmt.on_duplicate_key_update(
+            last_alter_id     = stmt.inserted.last_alter_id,
+            is_initial_done   = stmt.inserted.is_initial_done,
+            last_sync_time    = stmt.inserted.last_sync_time,
+            last_synced_month = func.coalesce(stmt.inserted.last_synced_month, table.c.last_synced_month),
+            updated_at        = func.now(),
+        ))
+    else:
         state = db.query(SyncState).filter_by(
             company_name = company_name,
             voucher_type = voucher_type,
@@ -314,10 +671,23 @@ def update_sync_state(company_name, voucher_type, last_alter_id, engine, last_sy
                 last_sync_time    = datetime.utcnow(),
             ))
 
+def update_sync_state(company_name, voucher_type, last_alter_id, engine, last_synced_month=None, is_initial_done=True, db=None):
+    """
+    Write and commit the final SyncState row.
+
+    With *db* the row joins that session's pending writes and the whole
+    transaction commits here, so callers holding the company lock commit
+    under it; closing *db* stays with its owner.
+    """
+    own_session = db is None
+    if own_session:
+        db = _get_session(engine)
+    try:
+        _write_sync_state(db, company_name, voucher_type, last_alter_id, last_synced_month, is_initial_done)
         db.commit()
         logger.info(
-            f"SyncState finalised | company={company_name} | "
-            f"type={voucher_type} | alter_id={last_alter_id}"
+            "SyncState finalised | company=%s | type=%s | alter_id=%s",
+            company_name, voucher_type, last_alter_id,
         )
 
     except Exception:
@@ -325,7 +695,8 @@ def update_sync_state(company_name, voucher_type, last_alter_id, engine, last_sy
         logger.exception("Error updating sync state")
         raise
     finally:
-        db.close()
+        if own_session:
+            db.close()
 
 def _upsert_inventory(rows, model_class, unique_fields, update_fields, engine):
     if not rows:
@@ -370,10 +741,13 @@ def _upsert_inventory(rows, model_class, unique_fields, update_fields, engine):
 
     return inserted, updated, unchanged, skipped
 
-def _upsert_inventory_voucher(rows, model_class, engine):
+def _upsert_inventory_voucher(rows, model_class, engine, db=None):
+    """Upsert in *db* when given (the caller commits), else in a session of our own."""
     if not rows:
         logger.warning(f"No rows to upsert for {model_class.__tablename__}")
         return 0, 0, 0, 0, 0
+    if db is not None:
+        return _upsert_inventory_voucher_in_session(rows, model_class, db)
     db = _get_session(engine)
     try:
         result = _upsert_inventory_voucher_in_session(rows, model_class, db)
@@ -386,10 +760,13 @@ def _upsert_inventory_voucher(rows, model_class, engine):
     finally:
         db.close()
 
-def _upsert_ledger_voucher(rows, model_class, engine):
+def _upsert_ledger_voucher(rows, model_class, engine, db=None):
+    """Upsert in *db* when given (the caller commits), else in a session of our own."""
     if not rows:
         logger.warning(f"No rows to upsert for {model_class.__tablename__}")
         return 0, 0, 0, 0, 0
+    if db is not None:
+        return _upsert_ledger_voucher_in_session(rows, model_class, db)
     db = _get_session(engine)
     try:
         result = _upsert_ledger_voucher_in_session(rows, model_class, db)
@@ -402,88 +779,92 @@ def _upsert_ledger_voucher(rows, model_class, engine):
     finally:
         db.close()
 
-def upsert_sales_vouchers(rows, engine):
-    i, u, unch, s, d = _upsert_inventory_voucher(rows, SalesVoucher, engine)
+def upsert_sales_vouchers(rows, engine=None, db=None):
+    i, u, unch, s, d = _upsert_inventory_voucher(rows, SalesVoucher, engine, db)
     _log_result("Sales vouchers upsert", i, u, unch, s, d)
 
-def upsert_purchase_vouchers(rows, engine):
-    i, u, unch, s, d = _upsert_inventory_voucher(rows, PurchaseVoucher, engine)
+def upsert_purchase_vouchers(rows, engine=None, db=None):
+    i, u, unch, s, d = _upsert_inventory_voucher(rows, PurchaseVoucher, engine, db)
     _log_result("Purchase vouchers upsert", i, u, unch, s, d)
 
-def upsert_credit_notes(rows, engine):
-    i, u, unch, s, d = _upsert_inventory_voucher(rows, CreditNote, engine)
+def upsert_credit_notes(rows, engine=None, db=None):
+    i, u, unch, s, d = _upsert_inventory_voucher(rows, CreditNote, engine, db)
     _log_result("Credit notes upsert", i, u, unch, s, d)
 
-def upsert_debit_notes(rows, engine):
-    i, u, unch, s, d = _upsert_inventory_voucher(rows, DebitNote, engine)
+def upsert_debit_notes(rows, engine=None, db=None):
+    i, u, unch, s, d = _upsert_inventory_voucher(rows, DebitNote, engine, db)
     _log_result("Debit notes upsert", i, u, unch, s, d)
 
-def upsert_receipt_vouchers(rows, engine):
-    i, u, unch, s, d = _upsert_ledger_voucher(rows, ReceiptVoucher, engine)
+def upsert_receipt_vouchers(rows, engine=None, db=None):
+    i, u, unch, s, d = _upsert_ledger_voucher(rows, ReceiptVoucher, engine, db)
     _log_result("Receipt vouchers upsert", i, u, unch, s, d)
 
-def upsert_payment_vouchers(rows, engine):
-    i, u, unch, s, d = _upsert_ledger_voucher(rows, PaymentVoucher, engine)
+def upsert_payment_vouchers(rows, engine=None, db=None):
+    i, u, unch, s, d = _upsert_ledger_voucher(rows, PaymentVoucher, engine, db)
     _log_result("Payment vouchers upsert", i, u, unch, s, d)
 
-def upsert_journal_vouchers(rows, engine):
-    i, u, unch, s, d = _upsert_ledger_voucher(rows, JournalVoucher, engine)
+def upsert_journal_vouchers(rows, engine=None, db=None):
+    i, u, unch, s, d = _upsert_ledger_voucher(rows, JournalVoucher, engine, db)
     _log_result("Journal vouchers upsert", i, u, unch, s, d)
 
-def upsert_contra_vouchers(rows, engine):
-    i, u, unch, s, d = _upsert_ledger_voucher(rows, ContraVoucher, engine)
+def upsert_contra_vouchers(rows, engine=None, db=None):
+    i, u, unch, s, d = _upsert_ledger_voucher(rows, ContraVoucher, engine, db)
     _log_result("Contra vouchers upsert", i, u, unch, s, d)
 
+_TRIAL_BALANCE_UPDATE_FIELDS = (
+    'parent_group', 'opening_balance', 'net_transactions',
+    'closing_balance', 'start_date', 'end_date',
+    'alter_id', 'master_id',
+)
+
 def upsert_trial_balance(rows, engine):
     if not rows:
         logger.warning("No rows to upsert for trial balance")
         return
 
     db = _get_session(engine)
-    inserted = updated = unchanged = skipped = 0
+    skipped = 0
 
-    update_fields = [
-        'parent_group', 'opening_balance', 'net_transactions',
-        'closing_balance', 'start_date', 'end_date',
-        'alter_id', 'master_id',
-    ]
+    update_fields = _TRIAL_BALANCE_UPDATE_FIELDS
+
+    def _mapping(row):
+        return {
+            'company_name'     : row.get('company_name'),
+            'ledger_name'      : row.get('ledger_name'),
+            'parent_group'     : row.get('parent_group'),
+            'opening_balance'  : row.get('opening_balance', 0.0),
+            'net_transactions' : row.get('net_transactions', 0.0),
+            'closing_balance'  : row.get('closing_balance', 0.0),
+            'start_date'       : row.get('start_date'),
+            'end_date'         : row.get('end_date'),
+            'guid'             : row.get('guid'),
+            'alter_id'         : row.get('alter_id', 0),
+            'master_id'        : row.get('master_id'),
+        }
 
     try:
+        keyed_rows = []
         for row in rows:
             if not row.get('guid'):
                 skipped += 1
                 continue
+            row = {
+                **row,
+                'start_date' : _as_date(row.get('start_date')),
+                'end_date'   : _as_date(row.get('end_date')),
+            }
+            keyed_rows.append(
+                ((row['guid'], row['company_name'], row['start_date'], row['end_date']), row)
+            )
 
-            existing = db.query(TrialBalance).filter_by(
-                guid         = row['guid'],
-                company_name = row['company_name'],
-                start_date   = row.get('start_date'),
-                end_date     = row.get('end_date'),
-            ).first()
+        keyed_rows, superseded = _dedupe_newest(keyed_rows)
 
-            if existing:
-                if int(row.get('alter_id', 0)) > int(existing.alter_id or 0):
-                    _log_changes("trial_balance UPDATE", existing, update_fields, row)
-                    for field in update_fields:
-                        setattr(existing, field, row.get(field))
-                    updated += 1
-                else:
-                    unchanged += 1
-            else:
-                db.add(TrialBalance(
-                    company_name     = row.get('company_name'),
-                    ledger_name      = row.get('ledger_name'),
-                    parent_group     = row.get('parent_group'),
-                    opening_balance  = row.get('opening_balance', 0.0),
-                    net_transactions = row.get('net_transactions', 0.0),
-                    closing_balance  = row.get('closing_balance', 0.0),
-                    start_date       = row.get('start_date'),
-                    end_date         = row.get('end_date'),
-                    guid             = row.get('guid'),
-                    alter_id         = row.get('alter_id', 0),
-                    master_id        = row.get('master_id'),
-                ))
-                inserted += 1
+        key_fields = ('guid', 'company_name', 'start_date', 'end_date')
+        inserted, updated, unchanged = _upsert_keyed(
+            db, TrialBalance, key_fields, keyed_rows, update_fields,
+            "trial_balance UPDATE", _mapping,
+        )
+        unchanged += superseded
 
         db.commit()
         _log_result("Trial balance upsert", inserted, updated, unchanged, skipped)
@@ -515,7 +896,7 @@ def upsert_items(rows, engine):
         return
 
     db = _get_session(engine)
-    inserted = updated = unchanged = skipped = 0
+    skipped = 0
 
     update_fields = [
         'item_name', 'parent_group', 'category',
@@ -544,37 +925,24 @@ def upsert_items(rows, engine):
         }
 
     try:
+        keyed_rows = []
         for row in rows:
             if not row.get('guid'):
                 skipped += 1
                 continue
-
             safe = _safe(row)
-
-            existing = db.query(Item).filter_by(
-                guid         = safe['guid'],
-                company_name = safe['company_name'],
-            ).first()
-
-            if existing:
-                if int(safe['alter_id']) > int(existing.alter_id or 0):
-                    _log_changes(
-                        "item UPDATE", existing,
-                        [f for f in safe if f not in ('guid', 'company_name')],
-                        safe,
-                    )
-                    for field, value in safe.items():
-                        if field not in ('guid', 'company_name'):
-                            setattr(existing, field, value)
-                    updated += 1
-                else:
-                    unchanged += 1
-            else:
-                db.add(Item(**safe))
-                inserted += 1
+            keyed_rows.append(((safe['guid'], safe['company_name']), safe))
+        keyed_rows, superseded = _dedupe_newest(keyed_rows)
+
+        key_fields    = ('guid', 'company_name')
+        update_fields = [f for f in update_fields if f not in key_fields]
+        inserted, updated, unchanged = _upsert_keyed(
+            db, Item, key_fields, keyed_rows, update_fields, "item UPDATE", dict,
+            alt_key_fields=('company_name', 'item_name'),
+        )
 
         db.commit()
-        _log_result("Items upsert", inserted, updated, unchanged, skipped)
+        _log_result("Items upsert", inserted, updated, unchanged + superseded, skipped)
 
     except Exception:
         db.rollback()
@@ -584,59 +952,209 @@ def upsert_items(rows, engine):
         db.close()
 
 
-def company_import_db(data, engine):
-    db = _get_session(engine)
+@lru_cache(maxsize=1024)
+def _company_date(value):
+    """YYYYMMDD → date; blank or unparseable values become None."""
+    if not value:
+        return None
+    if not isinstance(value, str):
+        return value
     try:
-        logger.info("Starting company import process")
-        df = pd.DataFrame(data)
-        df = df[df['name'].notna() & (df['name'].str.strip() != '')]
-        logger.info(f"Records after name filtering: {len(df)}")
+        return datetime.strptime(value, '%Y%m%d').date()
+    except ValueError:
+        return None
+
+_COMPANY_FIELDS = ('name', 'formal_name', 'company_number', 'starting_from', 'books_from', 'audited_upto')
+_company_values = itemgetter(*_COMPANY_FIELDS)   # projected row dict → tuple
+_company_attrs  = attrgetter(*_COMPANY_FIELDS)   # stored Company      → tuple
+
+def _company_record(row):
+    """Project one Tally company onto the companies columns, dates parsed."""
+    return {
+        'guid'           : row.get('guid'),
+        'name'           : row.get('name'),
+        'formal_name'    : row.get('formal_name'),
+        'company_number' : row.get('company_number'),
+        'starting_from'  : _company_date(row.get('starting_from')),
+        'books_from'     : _company_date(row.get('books_from')),
+        'audited_upto'   : _company_date(row.get('audited_upto')),
+    }
+
+def _log_company_changes(guid, old_values, new_values):
+    changes = [
+        f"  {field}: [{old_val}] → [{new_val}]"
+        for field, old_val, new_val in zip(_COMPANY_FIELDS, old_values, new_values)
+        if old_val != new_val
+    ]
+    logger.debug(
+        "company UPDATE | guid=%s | %d field(s) changed:\n%s",
+        guid, len(changes), "\n".join(changes),
+    )
 
-        date_cols = ['starting_from', 'books_from', 'audited_upto']
-        for col in date_cols:
-            if col in df.columns:
-                df[col] = pd.to_datetime(df[col], format="%Y%m%d", errors="coerce").dt.date
+def _split_company_conflicts(db, records):
+    """
+    Split guid-unique company *records* into (clean, conflicting).
 
-        inserted = updated = unchanged = skipped = 0
-        fields   = ["name", "formal_name", "company_number", "starting_from", "books_from", "audited_upto"]
+    companies is unique on both name and guid, so ON DUPLICATE KEY UPDATE
+    would silently overwrite another company whose name an incoming row
+    takes.  A row conflicts when its name is stored under a different guid
+    or is shared by several guids in the batch; those rows go through the
+    ORM path, which raises IntegrityError on them.
+    """
+    stored = _preload_existing(db, Company, ('name',), {(r['name'],) for r in records}, ('guid',))
+    owners = {}
+    for (name,), record in stored.items():
+        owners.setdefault(name, set()).add(record.guid)
+    for record in records:
+        owners.setdefault(_fold(record['name']), set()).add(record['guid'])
+
+    clean, conflicting = [], []
+    for record in records:
+        target = clean if len(owners[_fold(record['name'])]) == 1 else conflicting
+        target.append(record)
+    return clean, conflicting
+
+def _mysql_company_upsert(db, records):
+    """
+    Write guid-unique company *records* with INSERT ... ON DUPLICATE KEY
+    UPDATE per chunk and return (inserted, updated, unchanged).
 
-        for _, row in df.iterrows():
-            if not row.get("guid"):
-                skipped += 1
-                logger.warning("Skipped record due to missing GUID")
+    Each chunk preloads the stored fields of its guids to count the three
+    outcomes (and log diffs under DEBUG).  updated_at is assigned first,
+    while the SET list still sees the stored values, so it only moves when
+    some field actually differs.
+    """
+    table = Company.__table__
+    debug = logger.isEnabledFor(logging.DEBUG)
+    inserted = updated = unchanged = 0
+    for start in range(0, len(records), _UPSERT_CHUNK):
+        chunk    = records[start:start + _UPSERT_CHUNK]
+        existing = _preload_existing(db, Company, ('guid',), {(r['guid'],) for r in chunk}, _COMPANY_FIELDS)
+        for record in chunk:
+            stored = existing.get(_fold_key((record['guid'],)))
+            if stored is None:
+                inserted += 1
+                continue
+            old_values = _company_attrs(stored)
+            new_values = _company_values(record)
+            if old_values == new_values:
+                unchanged += 1
                 continue
+            if debug:
+                _log_company_changes(record['guid'], old_values, new_values)
+            updated += 1
+
+        stmt = mysql_insert(table).values(chunk)
+        same = and_(*(table.c[f].is_not_distinct_from(stmt.inserted[f]) for f in _COMPANY_FIELDS))
+        assignments = [('updated_at', func.if_(same, table.c.updated_at, func.now()))]
+        assignments.extend((f, stmt.inserted[f]) for f in _COMPANY_FIELDS)
+        db.execute(stmt.on_duplicate_key_update(assignments))
+    return inserted, updated, unchanged
+
+def _update_companies(db, changed):
+    """
+    Write {guid: (fields, dirty)} as executemany UPDATEs keyed on guid.
 
-            existing = db.query(Company).filter_by(guid=row["guid"]).first()
+    Rows are grouped by the set of columns that actually changed and each
+    group is one statement that only SETs those columns.  bulk_update_mappings
+    is keyed on the primary key, which for Company is the name itself and may
+    be one of the changed fields.
+    """
+    table  = Company.__table__
+    groups = {}
+    for guid, (fields, dirty) in changed.items():
+        columns = tuple(f for f in _COMPANY_FIELDS if f in dirty)
+        groups.setdefault(columns, []).append(
+            {'b_guid': guid, **{f'b_{f}': fields[f] for f in columns}}
+        )
+    for columns, params in groups.items():
+        stmt = (
+            table.update()
+            .where(table.c.guid == bindparam('b_guid'))
+            .values({f: bindparam(f'b_{f}') for f in columns})
+        )
+        db.execute(stmt, params)
+
+def _import_company_chunk(db, rows):
+    """Upsert one chunk of projected company rows; returns the four counters."""
+    inserted = updated = unchanged = 0
+
+    # Drop guid-less companies up front so neither path re-checks per row.
+    keyed   = [row for row in rows if row['guid']]
+    skipped = len(rows) - len(keyed)
+    if skipped:
+        logger.warning("Skipped %d record(s) due to missing GUID", skipped)
+
+    if _bulk_upsert_enabled(db, Company, ('guid',)):
+        records = {row["guid"]: row for row in keyed}
+        bulk, keyed = _split_company_conflicts(db, list(records.values()))
+        inserted, updated, unchanged = _mysql_company_upsert(db, bulk)
+
+    if keyed:
+        existing_map = _preload_existing(db, Company, ('guid',), {(row["guid"],) for row in keyed})
+        to_insert, to_update = {}, {}
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for row in keyed:
+            # Old values come from a row already staged in this chunk, else
+            # straight off the preloaded instance; a dict is only built for
+            # a stored company once it is known to have changed.
+            existing = to_insert.get(row["guid"]) or to_update.get(row["guid"], (None,))[0]
+            if existing is not None:
+                old_values = _company_values(existing)
+            else:
+                record = existing_map.get(_fold_key((row["guid"],)))
+                if record is None:
+                    to_insert[row["guid"]] = row
+                    inserted += 1
+                    continue
+                old_values = _company_attrs(record)
+
+            new_values = _company_values(row)
+            if old_values == new_values:
+                unchanged += 1
+                continue
 
-            if existing:
-                is_changed = False
-                changes = []
-                for field in fields:
-                    old_val = getattr(existing, field)
-                    new_val = row.get(field)
-                    if old_val != new_val:
-                        changes.append(f"  {field}: [{old_val}] → [{new_val}]")
-                        setattr(existing, field, new_val)
-                        is_changed = True
-                if is_changed:
-                    logger.debug(
-                        f"company UPDATE | guid={row['guid']} | "
-                        f"{len(changes)} field(s) changed:\n" + "\n".join(changes)
-                    )
-                    updated += 1
-                else:
-                    unchanged += 1
+            if existing is None:
+                existing = dict(zip(_COMPANY_FIELDS, old_values))
+            # Pending inserts are rewritten whole; stored rows remember
+            # which columns moved so the UPDATE only SETs those.
+            if row["guid"] in to_insert:
+                dirty = set()
             else:
-                db.add(Company(
-                    guid           = row["guid"],
-                    name           = row.get("name"),
-                    formal_name    = row.get("formal_name"),
-                    company_number = row.get("company_number"),
-                    starting_from  = row.get("starting_from"),
-                    books_from     = row.get("books_from"),
-                    audited_upto   = row.get("audited_upto"),
-                ))
-                inserted += 1
+                dirty = to_update.setdefault(row["guid"], (existing, set()))[1]
+            for field, old_val, new_val in zip(_COMPANY_FIELDS, old_values, new_values):
+                if old_val != new_val:
+                    existing[field] = new_val
+                    dirty.add(field)
+            if debug:
+                _log_company_changes(row['guid'], old_values, new_values)
+            updated += 1
+
+        if to_insert:
+            db.execute(Company.__table__.insert(), list(to_insert.values()))
+        if to_update:
+            _update_companies(db, to_update)
+    return inserted, updated, unchanged, skipped
+
+def company_import_db(data, engine, chunk_size=10000):
+    db = _get_session(engine)
+    try:
+        logger.info("Starting company import process")
+        inserted = updated = unchanged = skipped = kept = 0
+        source   = iter(data)
+        # Pull the input in fixed-size chunks so a large import never holds
+        # more than chunk_size projected rows.  Each row is projected onto the
+        # table columns in one pass; most companies share a handful of
+        # financial-year dates, so _company_date is memoized.
+        while chunk := list(islice(source, chunk_size)):
+            rows  = [_company_record(r) for r in chunk if (r.get('name') or '').strip()]
+            kept += len(rows)
+            i, u, unch, sk = _import_company_chunk(db, rows)
+            inserted  += i
+            updated   += u
+            unchanged += unch
+            skipped   += sk
+        logger.info("Records after name filtering: %d", kept)
 
         db.commit()
         _log_result("Company import", inserted, updated, unchanged, skipped)
@@ -648,82 +1166,81 @@ def company_import_db(data, engine):
     finally:
         db.close()
 
+# (column, max length) for upsert_ledgers; None copies the value as-is.
+_LEDGER_FIELD_SPEC = (
+    ('company_name',          255),
+    ('ledger_name',           255),
+    ('alias',                 255),
+    ('alias_2',               255),
+    ('alias_3',               255),
+    ('parent_group',          255),
+    ('contact_person',        255),
+    ('email',                 255),
+    ('phone',                 100),
+    ('mobile',                100),
+    ('fax',                   100),
+    ('website',               500),
+    ('address_line_1',        None),
+    ('address_line_2',        None),
+    ('address_line_3',        None),
+    ('pincode',               100),
+    ('state',                 255),
+    ('country',               255),
+    ('opening_balance',       100),
+    ('credit_limit',          100),
+    ('bill_credit_period',    100),
+    ('pan',                   100),
+    ('gstin',                 100),
+    ('gst_registration_type', 255),
+    ('vat_tin',               100),
+    ('sales_tax_number',      100),
+    ('bank_account_holder',   255),
+    ('ifsc_code',             100),
+    ('bank_branch',           255),
+    ('swift_code',            100),
+    ('bank_iban',             100),
+    ('export_import_code',    100),
+    ('msme_reg_number',       100),
+    ('is_bill_wise_on',        10),
+    ('is_deleted',             10),
+    ('created_date',           20),
+    ('altered_on',             20),
+    ('guid',                  255),
+    ('alter_id',              None),
+)
+
 def upsert_ledgers(rows, engine):
     if not rows:
         logger.warning("No rows to upsert for ledgers")
         return
 
     db = _get_session(engine)
-    inserted = updated = unchanged = skipped = 0
+    skipped = 0
 
     def _safe(row):
-        return {
-            'company_name'          : _t(row.get('company_name'),           255),
-            'ledger_name'           : _t(row.get('ledger_name'),            255),
-            'alias'                 : _t(row.get('alias'),                  255),
-            'alias_2'               : _t(row.get('alias_2'),                255),
-            'alias_3'               : _t(row.get('alias_3'),                255),
-            'parent_group'          : _t(row.get('parent_group'),           255),
-            'contact_person'        : _t(row.get('contact_person'),         255),
-            'email'                 : _t(row.get('email'),                  255),
-            'phone'                 : _t(row.get('phone'),                  100),
-            'mobile'                : _t(row.get('mobile'),                 100),
-            'fax'                   : _t(row.get('fax'),                    100),
-            'website'               : _t(row.get('website'),                500),
-            'address_line_1'        : row.get('address_line_1'),
-            'address_line_2'        : row.get('address_line_2'),
-            'address_line_3'        : row.get('address_line_3'),
-            'pincode'               : _t(row.get('pincode'),                100),
-            'state'                 : _t(row.get('state'),                  255),
-            'country'               : _t(row.get('country'),                255),
-            'opening_balance'       : _t(row.get('opening_balance'),        100),
-            'credit_limit'          : _t(row.get('credit_limit'),           100),
-            'bill_credit_period'    : _t(row.get('bill_credit_period'),     100),
-            'pan'                   : _t(row.get('pan'),                    100),
-            'gstin'                 : _t(row.get('gstin'),                  100),
-            'gst_registration_type' : _t(row.get('gst_registration_type'),  255),
-            'vat_tin'               : _t(row.get('vat_tin'),                100),
-            'sales_tax_number'      : _t(row.get('sales_tax_number'),       100),
-            'bank_account_holder'   : _t(row.get('bank_account_holder'),    255),
-            'ifsc_code'             : _t(row.get('ifsc_code'),              100),
-            'bank_branch'           : _t(row.get('bank_branch'),            255),
-            'swift_code'            : _t(row.get('swift_code'),             100),
-            'bank_iban'             : _t(row.get('bank_iban'),              100),
-            'export_import_code'    : _t(row.get('export_import_code'),     100),
-            'msme_reg_number'       : _t(row.get('msme_reg_number'),        100),
-            'is_bill_wise_on'       : _t(row.get('is_bill_wise_on'),         10),
-            'is_deleted'            : _t(row.get('is_deleted'),              10),
-            'created_date'          : _t(row.get('created_date'),            20),
-            'altered_on'            : _t(row.get('altered_on'),              20),
-            'guid'                  : _t(row.get('guid'),                   255),
-            'alter_id'              : row.get('alter_id', 0),
+        safe = {
+            f: row.get(f) if max_len is None else _t(row.get(f), max_len)
+            for f, max_len in _LEDGER_FIELD_SPEC
         }
+        safe['alter_id'] = row.get('alter_id', 0)
+        return safe
 
     try:
+        keyed_rows = []
         for row in rows:
             if not row.get('guid'):
                 skipped += 1
                 continue
-
             safe = _safe(row)
+            keyed_rows.append(((safe['guid'], safe['company_name']), safe))
+        keyed_rows, superseded = _dedupe_newest(keyed_rows)
 
-            existing = db.query(Ledger).filter_by(
-                guid         = safe['guid'],
-                company_name = safe['company_name'],
-            ).first()
-
-            if existing:
-                if int(safe['alter_id']) > int(existing.alter_id or 0):
-                    _log_changes("ledger UPDATE", existing, [f for f in safe if f not in ('guid', 'company_name')], safe)
-                    for field, value in safe.items():
-                        if field not in ('guid', 'company_name'):
-                            setattr(existing, field, value)
-                    updated += 1
-                else:
-                    unchanged += 1
-            else:
-                db.add(Ledger(**safe))
-                inserted += 1
+        key_fields    = ('guid', 'company_name')
+        update_fields = [f for f, _ in _LEDGER_FIELD_SPEC if f not in key_fields]
+        inserted, updated, unchanged = _upsert_keyed(
+            db, Ledger, key_fields, keyed_rows, update_fields, "ledger UPDATE", dict,
+        )
+        unchanged += superseded
 
         db.commit()
         _log_result("Ledgers upsert", inserted, updated, unchanged, skipped)
@@ -733,4 +1250,4 @@ def upsert_ledgers(rows, engine):
         logger.exception("Error upserting ledgers")
         raise
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
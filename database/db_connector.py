@@ -2,6 +2,7 @@ import os
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.pool import NullPool
 from urllib.parse import quote_plus
 from typing import Optional, Dict, Any
 from contextlib import contextmanager
@@ -17,12 +18,14 @@ logger = logging.getLogger(__name__)
 class DatabaseConnector:
     """Enhanced database connector with CDC support"""
     
-    def __init__(self, username: str, password: str, host: str, port: int, database: str = None):
+    def __init__(self, username: str, password: str, host: str, port: int, database: str = None,
+                 echo: bool = False):
         self.username = username
         self.password = password
         self.host = host
         self.port = port
         self.database = database
+        self.echo = echo
         self.engine = None
         self.SessionLocal = None
 
@@ -39,10 +42,11 @@ class DatabaseConnector:
     def create_database_if_not_exists(self):
         """Create database if it doesn't exist"""
         try:
-            engine = create_engine(self.get_db_string(with_db=False))
-            with engine.connect() as conn:
+            # One-shot server-level engine: NullPool so no idle connection
+            # is left behind once the CREATE DATABASE is done
+            engine = create_engine(self.get_db_string(with_db=False), poolclass=NullPool)
+            with engine.begin() as conn:
                 conn.execute(text(f"CREATE DATABASE IF NOT EXISTS `{self.database}` CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci"))
-                conn.commit()
             engine.dispose()
             logger.info(f"Database '{self.database}' ensured to exist")
         except Exception as e:
@@ -58,8 +62,14 @@ class DatabaseConnector:
                 pool_recycle=3600,   # Recycle connections after 1 hour
                 pool_size=10,        # Connection pool size
                 max_overflow=20,     # Max overflow connections
-                echo=False,          # Set to True for SQL debugging
-                isolation_level="READ COMMITTED"
+                pool_use_lifo=True,  # Reuse the most recently returned (warm) connection
+                pool_reset_on_return="rollback",
+                echo=self.echo,      # SQL_ECHO=1 in .env for SQL debugging
+                isolation_level="READ COMMITTED",
+                # Rows per batched INSERT when SQLAlchemy's insertmanyvalues
+                # applies.  Plain executemany INSERTs are already folded into
+                # multi-row VALUES by pymysql; executemany_mode is psycopg2-only.
+                insertmanyvalues_page_size=10000,
             )
             logger.info(f"Database engine created for '{self.database}'")
         return self.engine
@@ -91,6 +101,7 @@ class DatabaseConnector:
             self.SessionLocal = sessionmaker(
                 autocommit=False,
                 autoflush=False,
+                expire_on_commit=False,
                 bind=engine
             )
         return self.SessionLocal()
@@ -1,6 +1,25 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Date
-from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy import Column, DateTime
+from sqlalchemy.orm import declarative_base, declared_attr, deferred
 from sqlalchemy.sql import func
-from datetime import datetime
 
-Base = declarative_base()
\ No newline at end of file
+Base = declarative_base()
+
+
+class TimestampMixin:
+    """
+    Row created_at / updated_at stamped by the database clock.
+
+    The INSERT sends NOW() itself (default) as well as declaring it as the
+    server default: tables are only built by create_all, so ones created
+    before the server default existed would otherwise get NULLs.  Both are
+    deferred: the sync paths never read them, so a plain query of the
+    model leaves them out of the SELECT and they load on first access.
+    """
+
+    @declared_attr
+    def created_at(cls):
+        return deferred(Column(DateTime, default=func.now(), server_default=func.now()))
+
+    @declared_attr
+    def updated_at(cls):
+        return deferred(Column(DateTime, default=func.now(), server_default=func.now(), onupdate=func.now()))
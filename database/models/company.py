@@ -1,9 +1,8 @@
-from sqlalchemy import Column, String, Date, DateTime
-from .base import Base
-from datetime import datetime
+from sqlalchemy import Column, String, Date, Index
+from .base import Base, TimestampMixin
 
 
-class Company(Base):
+class Company(TimestampMixin, Base):
     __tablename__ = 'companies'
 
     guid           = Column(String(255), nullable=False)
@@ -13,8 +12,11 @@ class Company(Base):
     starting_from  = Column(Date,        nullable=True)
     books_from     = Column(Date,        nullable=True)
     audited_upto   = Column(Date,        nullable=True)
-    created_at     = Column(DateTime,    default=datetime.utcnow)
-    updated_at     = Column(DateTime,    default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    # Upsert lookup key — company imports match on guid, not on name
+    __table_args__ = (
+        Index('ix_companies_guid', 'guid', unique=True),
+    )
 
     def __repr__(self):
         return f"<Company(name={self.name}, guid={self.guid})>"
\ No newline at end of file
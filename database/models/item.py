@@ -1,6 +1,7 @@
 from sqlalchemy import (
     Column, String, Numeric, Integer, DateTime, UniqueConstraint, Index
 )
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from .base import Base
 
@@ -35,10 +36,10 @@ class Item(Base):
     remote_alt_guid   = Column(String(100),  nullable=False, default='')
     alter_id          = Column(Integer,      nullable=False, default=0, index=True)
 
-    # ── Row timestamps ───────────────────────────────────────────────────────
-    created_at        = Column(DateTime, server_default=func.now(), nullable=False)
-    updated_at        = Column(DateTime, server_default=func.now(),
-                               onupdate=func.now(), nullable=False)
+    # ── Row timestamps (NOT NULL, so not TimestampMixin; deferred the same) ──
+    created_at        = deferred(Column(DateTime, server_default=func.now(), nullable=False))
+    updated_at        = deferred(Column(DateTime, server_default=func.now(),
+                                        onupdate=func.now(), nullable=False))
 
     # ── Constraints & indexes ────────────────────────────────────────────────
     __table_args__ = (
@@ -1,9 +1,8 @@
-from sqlalchemy import Column, String, BigInteger, DateTime, Text
-from sqlalchemy.sql import func
-from .base import Base
+from sqlalchemy import Column, String, BigInteger, Text, UniqueConstraint, Index
+from .base import Base, TimestampMixin
 
 
-class Ledger(Base):
+class Ledger(TimestampMixin, Base):
     __tablename__ = 'ledgers'
 
     id                    = Column(BigInteger,  primary_key=True, autoincrement=True)
@@ -46,8 +45,12 @@ class Ledger(Base):
     altered_on            = Column(String(20),  nullable=True)
     guid                  = Column(String(255), nullable=False, index=True)
     alter_id              = Column(BigInteger,  nullable=False, default=0)
-    created_at            = Column(DateTime,    server_default=func.now())
-    updated_at            = Column(DateTime,    server_default=func.now(), onupdate=func.now())
+
+    # Upsert lookup key
+    __table_args__ = (
+        UniqueConstraint('guid', 'company_name', name='uq_ledger_lookup'),
+        Index('ix_ledger_company_alter_id', 'company_name', 'alter_id'),
+    )
 
     def __repr__(self):
         return f"<Ledger(company='{self.company_name}', name='{self.ledger_name}', guid='{self.guid}')>"
\ No newline at end of file
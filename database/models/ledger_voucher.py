@@ -1,9 +1,9 @@
-from sqlalchemy import Column, String, BigInteger, DateTime, Float, Date, Text
-from sqlalchemy.sql import func
-from .base import Base
+from sqlalchemy import Column, String, BigInteger, Float, Date, Text, UniqueConstraint, Index
+from sqlalchemy.orm import declared_attr
+from .base import Base, TimestampMixin
 
 
-class _LedgerVoucherMixin:
+class _LedgerVoucherMixin(TimestampMixin):
     id             = Column(BigInteger,   primary_key=True, autoincrement=True)
     company_name   = Column(String(255),  nullable=False, index=True)
     date           = Column(Date,         nullable=True,  index=True)
@@ -21,8 +21,15 @@ class _LedgerVoucherMixin:
     master_id      = Column(String(255),  nullable=True)
     change_status  = Column(String(50),   nullable=True)
     is_deleted     = Column(String(3),    nullable=False, default='No')
-    created_at     = Column(DateTime,     server_default=func.now())
-    updated_at     = Column(DateTime,     server_default=func.now(), onupdate=func.now())
+
+    # Upsert lookup key
+    @declared_attr
+    def __table_args__(cls):
+        return (
+            UniqueConstraint('guid', 'company_name', 'ledger_name', name=f'uq_{cls.__tablename__}_lookup'),
+            Index(f'ix_{cls.__tablename__}_company_alter_id', 'company_name', 'alter_id'),
+            Index(f'ix_{cls.__tablename__}_company_date', 'company_name', 'date'),
+        )
 
 
 class ReceiptVoucher(_LedgerVoucherMixin, Base):
@@ -1,8 +1,8 @@
-from datetime import datetime
 from sqlalchemy import (
     Column, String, Boolean, Integer, DateTime,
     UniqueConstraint,
 )
+from sqlalchemy.sql import func
 from .base import Base
 
 class CompanySchedulerConfig(Base):
@@ -14,8 +14,8 @@ class CompanySchedulerConfig(Base):
     interval     = Column(String(20),  nullable=False, default="hourly")
     value        = Column(Integer,     nullable=False, default=1)
     time         = Column(String(10),  nullable=False, default="09:00")
-    updated_at   = Column(DateTime,    nullable=False, default=datetime.utcnow,
-                          onupdate=datetime.utcnow)
+    updated_at   = Column(DateTime,    nullable=False, default=func.now(),
+                          server_default=func.now(), onupdate=func.now())
 
     def __repr__(self):
         return (
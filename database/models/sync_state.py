@@ -1,9 +1,8 @@
 from sqlalchemy import Column, String, BigInteger, DateTime, Boolean
-from sqlalchemy.sql import func
-from .base import Base
+from .base import Base, TimestampMixin
 
 
-class SyncState(Base):
+class SyncState(TimestampMixin, Base):
     __tablename__ = 'sync_state'
 
     company_name      = Column(String(255), primary_key=True, nullable=False)
@@ -12,8 +11,6 @@ class SyncState(Base):
     is_initial_done   = Column(Boolean,     nullable=False, default=False)
     last_synced_month = Column(String(6),   nullable=True)
     last_sync_time    = Column(DateTime,    nullable=True)
-    created_at        = Column(DateTime,    server_default=func.now())
-    updated_at        = Column(DateTime,    server_default=func.now(), onupdate=func.now())
 
     def __repr__(self):
         return (
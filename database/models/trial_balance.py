@@ -1,9 +1,8 @@
-from sqlalchemy import Column, String, BigInteger, DateTime, Float, Date
-from sqlalchemy.sql import func
-from .base import Base
+from sqlalchemy import Column, String, BigInteger, Float, Date, UniqueConstraint, Index
+from .base import Base, TimestampMixin
 
 
-class TrialBalance(Base):
+class TrialBalance(TimestampMixin, Base):
     __tablename__ = 'trial_balance'
 
     id               = Column(BigInteger,  primary_key=True, autoincrement=True)
@@ -18,8 +17,12 @@ class TrialBalance(Base):
     guid             = Column(String(255), nullable=False, index=True)
     alter_id         = Column(BigInteger,  nullable=False, default=0)
     master_id        = Column(String(255), nullable=True)
-    created_at       = Column(DateTime,    server_default=func.now())
-    updated_at       = Column(DateTime,    server_default=func.now(), onupdate=func.now())
+
+    # Upsert lookup key
+    __table_args__ = (
+        UniqueConstraint('guid', 'company_name', 'start_date', 'end_date', name='uq_trial_balance_lookup'),
+        Index('ix_trial_balance_company_alter_id', 'company_name', 'alter_id'),
+    )
 
     def __repr__(self):
         return (
@@ -17,8 +17,12 @@ Usage (from run_gui.py):
     app.run()
 """
 
+import importlib
+import os
 import threading
 import queue
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 import tkinter as tk
 from tkinter import ttk, messagebox
 from datetime import datetime
@@ -38,16 +42,75 @@ from gui.styles import (
 )
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+#  .env parsing
+# ─────────────────────────────────────────────────────────────────────────────
+def _parse_kv(text: str):
+    """Yield (KEY, value) pairs from .env text, skipping blanks and comments."""
+    for line in text.splitlines():
+        s = line.strip()
+        if not s or s[0] == "#":
+            continue
+        k, sep, v = s.partition("=")
+        if sep:
+            # Strip optional surrounding quotes  'val'  or  "val"
+            yield k.strip().upper(), v.strip().strip("'\"")
+
+
+def _ymd(value) -> str | None:
+    """Normalise a date / 'YYYY-MM-DD' / 'YYYYMMDD' value to 'YYYYMMDD'."""
+    if not value:
+        return None
+    if hasattr(value, "strftime"):
+        return value.strftime("%Y%m%d")
+    s = str(value)
+    if len(s) >= 10 and s[4] == "-" and s[7] == "-":
+        return s[0:4] + s[5:7] + s[8:10]
+    return s.replace("-", "")[:8]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Background → GUI queue
+# ─────────────────────────────────────────────────────────────────────────────
+class _NotifyQueue(queue.Queue):
+    """queue.Queue that calls *notify* after every put, outside the queue lock."""
+
+    def __init__(self, notify):
+        super().__init__()
+        self._notify = notify
+
+    def put(self, item, block=True, timeout=None):
+        super().put(item, block, timeout)
+        self._notify()
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 #  Main Application Class
 # ─────────────────────────────────────────────────────────────────────────────
 class TallySyncApp:
 
+    QUEUE_SAFETY_TICK_MS = 1000               # fallback drain if a wakeup is missed
+
     def __init__(self):
         self.state   = AppState()
-        self._q      = queue.Queue()          # background → GUI communication
+        self._wake_ready = False              # set once the Tk mainloop is running
+        self._draining   = False              # guards _drain_queue re-entry
+        self._wake_pending = False            # a <<QueueMsg>> is already on its way
+        self._q      = _NotifyQueue(self._wake)  # background → GUI communication
         self._frames = {}                     # page_key → Frame instance
         self._active_page = None
+        # event name → handler; sync_log is batched in _drain_queue instead
+        self._handlers = {
+            "db_status":           self._on_db_status,
+            "tally_status":        self._on_tally_status,
+            "companies_loaded":    self._on_companies_loaded,
+            "tally_companies":     self._on_tally_companies,
+            "error":               self._on_error,
+            "sync_done":           self._on_sync_done,
+            "scheduler_updated":   self._on_sched_updated,
+            "scheduler_sync_done": self._on_sched_updated,
+            "scheduler_job_error": self._on_sched_error,
+        }
 
         self._build_root()
         self._build_layout()
@@ -59,8 +122,13 @@ class TallySyncApp:
         self.state.on("sync_finished", self._on_sync_finished_app)
         self._snapshot_celebrated: set = set()
 
+        # A put on an undrained self._q wakes the Tk loop through
+        # <<QueueMsg>>; the slow _poll_queue tick only backs that up.
+        self.root.bind("<<QueueMsg>>", lambda e: self._drain_queue())
+        self.root.after(0, self._enable_wake)
+
         self._start_startup_sequence()
-        self._poll_queue()                    # start queue polling loop
+        self._poll_queue()                    # start safety polling loop
 
     # ─────────────────────────────────────────────────────────────────────────
     #  Root window
@@ -72,12 +140,11 @@ class TallySyncApp:
             self.root = tk.Tk()
 
         self.root.title(f"{APP_TITLE}  {APP_VERSION}")
-        self.root.geometry(f"{Layout.MIN_WIDTH}x{Layout.MIN_HEIGHT}")
         self.root.minsize(Layout.MIN_WIDTH, Layout.MIN_HEIGHT)
         self.root.configure(bg=Color.BG_ROOT)
 
-        # Center on screen
-        self.root.update_idletasks()
+        # Center on screen — screen size needs no idle pass, and the window
+        # size is the configured minimum, so set size + position in one call.
         sw = self.root.winfo_screenwidth()
         sh = self.root.winfo_screenheight()
         x  = (sw - Layout.MIN_WIDTH)  // 2
@@ -141,6 +208,8 @@ class TallySyncApp:
         for item in NAV_ITEMS:
             btn = self._make_nav_button(nav_container, item)
             self._nav_buttons[item["page"]] = btn
+        # NAV_ITEMS is fixed — precompute what _set_active_nav walks
+        self._nav_list = tuple((key, btn._paint) for key, btn in self._nav_buttons.items())
 
         # ── Bottom — version + tally status ──────────────
         bottom = tk.Frame(f, bg=Color.BG_SIDEBAR)
@@ -167,62 +236,57 @@ class TallySyncApp:
             anchor="w",
         ).pack(fill="x")
 
-    def _make_nav_button(self, parent, item: dict) -> tk.Frame:
+    def _make_nav_button(self, parent, item: dict) -> tk.Label:
         """Create a sidebar nav item that looks like a button."""
-        container = tk.Frame(parent, bg=Color.BG_SIDEBAR, cursor="hand2")
-        container.pack(fill="x")
-
-        inner = tk.Frame(container, bg=Color.BG_SIDEBAR, padx=Spacing.LG, pady=Spacing.MD)
-        inner.pack(fill="x")
-
-        icon_lbl = tk.Label(
-            inner,
-            text=item["icon"],
-            font=Font.BODY,
-            bg=Color.BG_SIDEBAR,
-            fg=Color.SIDEBAR_TEXT,
-            width=2,
-        )
-        icon_lbl.pack(side="left")
-
-        text_lbl = tk.Label(
-            inner,
-            text=item["label"],
+        # One Label per row (icon baked into the text): a single widget and
+        # a single set of bindings instead of Frame/Frame/Label/Label.
+        lbl = tk.Label(
+            parent,
+            text=f"{item['icon']}   {item['label']}",
             font=Font.SIDEBAR_ITEM,
             bg=Color.BG_SIDEBAR,
             fg=Color.SIDEBAR_TEXT,
             anchor="w",
+            padx=Spacing.LG,
+            pady=Spacing.MD,
+            cursor="hand2",
         )
-        text_lbl.pack(side="left", padx=(Spacing.SM, 0))
+        lbl.pack(fill="x")
 
         page_key = item["page"]
-        widgets  = [container, inner, icon_lbl, text_lbl]
-
-        def on_enter(e):
-            if self._active_page != page_key:
-                for w in widgets: w.configure(bg=Color.SIDEBAR_HOVER_BG)
-        def on_leave(e):
-            if self._active_page != page_key:
-                for w in widgets: w.configure(bg=Color.BG_SIDEBAR)
+        painted  = [Color.BG_SIDEBAR]          # bg the label currently shows
+
+        # Constants are bound as defaults so the hover handlers read locals
+        # instead of module globals.
+        def paint(bg, painted=painted, configure=lbl.configure):
+            # Only touch Tk when the colour actually changes.
+            if painted[0] != bg:
+                painted[0] = bg
+                configure(bg=bg)
+
+        def on_enter(e, app=self, key=page_key, paint=paint, hover=Color.SIDEBAR_HOVER_BG):
+            if app._active_page != key:
+                paint(hover)
+        def on_leave(e, app=self, key=page_key, paint=paint, idle=Color.BG_SIDEBAR):
+            if app._active_page != key:
+                paint(idle)
         def on_click(e):
             self.navigate(page_key)
 
-        for w in widgets:
-            w.bind("<Enter>",   on_enter)
-            w.bind("<Leave>",   on_leave)
-            w.bind("<Button-1>",on_click)
+        lbl.bind("<Enter>",   on_enter)
+        lbl.bind("<Leave>",   on_leave)
+        lbl.bind("<Button-1>",on_click)
 
-        # Store widget refs for active state toggling
-        container._widgets  = widgets
-        container._page_key = page_key
-        return container
+        # Store refs for active state toggling
+        lbl._paint    = paint
+        lbl._page_key = page_key
+        return lbl
 
     def _set_active_nav(self, page_key: str):
-        for key, btn in self._nav_buttons.items():
-            is_active = (key == page_key)
-            bg = Color.SIDEBAR_ACTIVE_BG if is_active else Color.BG_SIDEBAR
-            for w in btn._widgets:
-                w.configure(bg=bg)
+        active_bg = Color.SIDEBAR_ACTIVE_BG
+        normal_bg = Color.BG_SIDEBAR
+        for key, paint in self._nav_list:
+            paint(active_bg if key == page_key else normal_bg)
 
     # ─────────────────────────────────────────────────────────────────────────
     #  Header bar (top of main area)
@@ -271,6 +335,8 @@ class TallySyncApp:
             fg=Color.TEXT_SECONDARY,
         )
         self._clock_lbl.pack(side="left")
+        self._clock_text = ""
+        self._clock_date = (None, "")         # (date, "dd Mon YYYY") for today
         self._update_clock()
 
         # ⚙ DB Settings button
@@ -287,9 +353,16 @@ class TallySyncApp:
         )
 
     def _update_clock(self):
-        now = datetime.now().strftime("%d %b %Y  %H:%M:%S")
-        self._clock_lbl.configure(text=now)
-        self.root.after(1000, self._update_clock)
+        now   = datetime.now()
+        today = now.date()
+        if self._clock_date[0] != today:
+            self._clock_date = (today, now.strftime("%d %b %Y"))
+        text = f"{self._clock_date[1]}  {now.hour:02d}:{now.minute:02d}:{now.second:02d}"
+        if text != self._clock_text:
+            self._clock_text = text
+            self._clock_lbl.configure(text=text)
+        # Tick just after the next second boundary so no second is shown twice
+        self.root.after(1000 - now.microsecond // 1000, self._update_clock)
 
     # ─────────────────────────────────────────────────────────────────────────
     #  Content area — pages stack here
@@ -297,49 +370,64 @@ class TallySyncApp:
     def _build_content_area(self):
         self.content_frame = tk.Frame(self.main_frame, bg=Color.BG_ROOT)
         self.content_frame.grid(row=1, column=0, sticky="nsew")
-        self.content_frame.rowconfigure(0, weight=1)
-        self.content_frame.columnconfigure(0, weight=1)
+        # Pages are stacked with place() (see _build_page), so this frame
+        # needs no grid weights; its size comes from main_frame's row 1.
 
     # ─────────────────────────────────────────────────────────────────────────
     #  Page management
     # ─────────────────────────────────────────────────────────────────────────
+    # page_key → (module, class); imported and built on first navigate()
+    _PAGE_CLASSES = {
+        "home":      ("gui.pages.home_page",      "HomePage"),
+        "sync":      ("gui.pages.sync_page",      "SyncPage"),
+        "scheduler": ("gui.pages.scheduler_page", "SchedulerPage"),
+        "logs":      ("gui.pages.logs_page",      "LogsPage"),
+        "settings":  ("gui.pages.settings_page",  "SettingsPage"),
+    }
+    # Logs must exist from the start so its live tab receives every sync line
+    _EAGER_PAGES = ("home", "logs")
+
     def _load_pages(self):
         """
-        Import and instantiate all pages.
+        Instantiate the pages needed at startup; the rest are built lazily
+        by navigate() the first time they are shown.
         Each page is a Frame that fills the content_area.
-        They are stacked (grid) and only the active one is raised.
+        They are stacked (place) and only the active one is raised.
         """
-        # Import here (not at top) to avoid circular imports
-        from gui.pages.home_page      import HomePage
-        from gui.pages.sync_page      import SyncPage
-        from gui.pages.scheduler_page import SchedulerPage
-        from gui.pages.logs_page      import LogsPage
-        from gui.pages.settings_page  import SettingsPage
-
-        page_classes = {
-            "home":      HomePage,
-            "sync":      SyncPage,
-            "scheduler": SchedulerPage,
-            "logs":      LogsPage,
-            "settings":  SettingsPage,
-        }
-
-        for key, PageClass in page_classes.items():
-            frame = PageClass(
-                parent   = self.content_frame,
-                state    = self.state,
-                navigate = self.navigate,
-                app      = self,
-            )
-            frame.grid(row=0, column=0, sticky="nsew")
-            self._frames[key] = frame
+        for key in self._EAGER_PAGES:
+            self._build_page(key)
 
         # Show home page first
         self.navigate("home")
 
+    def _build_page(self, page_key: str):
+        """Import, instantiate and grid one page; returns None for unknown keys."""
+        spec = self._PAGE_CLASSES.get(page_key)
+        if spec is None:
+            return None
+
+        # Import here (not at top) to avoid circular imports
+        module_name, class_name = spec
+        PageClass = getattr(importlib.import_module(module_name), class_name)
+        frame = PageClass(
+            parent   = self.content_frame,
+            state    = self.state,
+            navigate = self.navigate,
+            app      = self,
+        )
+        # Overlapping place() stack: tkraise() only restacks, with no grid
+        # re-solve across every page sharing the cell.
+        frame.place(x=0, y=0, relwidth=1, relheight=1)
+        # Capability bits probed once here instead of hasattr() per message
+        frame._has_on_show     = callable(getattr(frame, "on_show", None))
+        frame._has_refresh     = callable(getattr(frame, "refresh_companies", None))
+        frame._has_append_logs = callable(getattr(frame, "append_logs", None))
+        self._frames[page_key] = frame
+        return frame
+
     def navigate(self, page_key: str):
-        """Switch to the given page."""
-        if page_key not in self._frames:
+        """Switch to the given page, building it on first visit."""
+        if page_key not in self._frames and self._build_page(page_key) is None:
             return
 
         # Raise the target page
@@ -361,13 +449,15 @@ class TallySyncApp:
 
         # Notify the page it's being shown (if it has on_show)
         page = self._frames[page_key]
-        if hasattr(page, "on_show"):
+        if page._has_on_show:
             page.on_show()
 
     # ─────────────────────────────────────────────────────────────────────────
     #  DB config — load from file or prompt user
     # ─────────────────────────────────────────────────────────────────────────
     _ENV_FILE = ".env"   # sits next to run_gui.py
+    _ENV_ALT  = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+    _env_cache: tuple | None = None   # ((path, mtime_ns), parsed env dict)
 
     def _load_db_config(self) -> dict:
         """
@@ -384,14 +474,12 @@ class TallySyncApp:
         or any required key is absent, which the startup worker will
         catch and display as an error dialog.
         """
-        import os
-
         env_path = self._ENV_FILE
 
         # ── Locate .env ───────────────────────────────────
         if not os.path.exists(env_path):
             # Also check one directory up (in case run from a sub-folder)
-            alt = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+            alt = self._ENV_ALT
             if os.path.exists(alt):
                 env_path = alt
             else:
@@ -406,19 +494,15 @@ class TallySyncApp:
                 )
 
         # ── Parse .env (simple key=value, ignore comments/blanks) ─
-        env: dict[str, str] = {}
-        with open(env_path, "r", encoding="utf-8") as f:
-            for line in f:
-                line = line.strip()
-                if not line or line.startswith("#"):
-                    continue
-                if "=" not in line:
-                    continue
-                key, _, val = line.partition("=")
-                # Strip optional surrounding quotes  'val'  or  "val"
-                key = key.strip().upper()
-                val = val.strip().strip("'\"")
-                env[key] = val
+        # Re-read only when the file changed since the last call; saving
+        # the settings dialog rewrites it and so invalidates the cache.
+        stamp = (env_path, os.stat(env_path).st_mtime_ns)
+        if self._env_cache and self._env_cache[0] == stamp:
+            env = self._env_cache[1]
+        else:
+            with open(env_path, "r", encoding="utf-8") as f:
+                env = dict(_parse_kv(f.read()))
+            self._env_cache = (stamp, env)
 
         # ── Validate required keys ────────────────────────
         missing = [k for k in ("DB_USERNAME", "DB_NAME") if not env.get(k)]
@@ -472,6 +556,42 @@ class TallySyncApp:
         threading.Thread(target=self._startup_worker, daemon=True).start()
 
     def _startup_worker(self):
+        # The Tally ping is independent network I/O and can block for
+        # seconds when Tally is closed, so run it alongside the DB work.
+        # DB companies are shown as soon as they load; the Tally company
+        # list is merged in afterwards.
+        ex = ThreadPoolExecutor(max_workers=2, thread_name_prefix="startup")
+        fut_tally = ex.submit(self._ping_tally_only)
+        try:
+            if not self._startup_db(ex):
+                return   # Can't do anything without DB
+        finally:
+            ex.shutdown(wait=False)
+
+        # ── Step 4: Report Tally status ───────────────────
+        tally     = fut_tally.result()
+        connected = tally is not None and tally.status == "Connected"
+        self.state.tally.connected  = connected
+        self.state.tally.last_check = datetime.now()
+        self._q.put(("tally_status", connected))
+
+        # ── Step 5: Merge the Tally company list ──────────
+        if connected:
+            self._q.put(("tally_companies", self._fetch_tally_companies(tally)))
+
+    def _ping_tally_only(self):
+        """Connect to the configured Tally host; returns the connector, or None on error."""
+        try:
+            from services.tally_connector import TallyConnector
+            return TallyConnector(
+                host=self.state.tally.host,
+                port=self.state.tally.port,
+            )
+        except Exception:
+            return None
+
+    def _startup_db(self, ex):
+        """Connect to the DB and load its companies; returns False if the DB is unreachable."""
         # ── Step 1: Connect to database ──────────────────
         try:
             cfg    = self._load_db_config()
@@ -481,40 +601,34 @@ class TallySyncApp:
             self._q.put(("db_status", True, "Connected"))
         except Exception as e:
             self._q.put(("db_status", False, str(e)))
-            return   # Can't do anything without DB
+            return False
+
+        # The scheduler-config SELECT does not depend on the company list,
+        # so fetch it on the executor while companies load.
+        from gui.controllers.company_controller import CompanyController
+        sched_ctrl = CompanyController(self.state)
+        fut_sched  = ex.submit(sched_ctrl.fetch_scheduler_config)
 
         # ── Step 2: Load companies from DB ───────────────
         try:
-            self._load_companies_from_db(engine)
+            self._read_db_companies(engine)
         except Exception as e:
             self._q.put(("error", f"Failed to load companies: {e}"))
 
-        # ── Step 3: Load scheduler config from DB ────────
-        # IMPORTANT: must run AFTER _load_companies_from_db so that the
+        # ── Step 3: Apply scheduler config ────────────────
+        # IMPORTANT: must run AFTER _read_db_companies so that the
         # CompanyState objects already exist and can receive schedule fields.
         try:
-            from gui.controllers.company_controller import CompanyController
-            CompanyController(self.state).load_scheduler_config()
+            rows = fut_sched.result()
+            if rows is not None:
+                sched_ctrl.apply_scheduler_config(rows)
         except Exception as e:
             from logging_config import logger
             logger.warning(f"[App] Could not load scheduler config: {e}")
 
         # companies_loaded triggers home + scheduler page refresh
         self._q.put(("companies_loaded", None))
-
-        # ── Step 3: Ping Tally ────────────────────────────
-        try:
-            from services.tally_connector import TallyConnector
-            tally = TallyConnector(
-                host=self.state.tally.host,
-                port=self.state.tally.port,
-            )
-            connected = (tally.status == "Connected")
-            self.state.tally.connected  = connected
-            self.state.tally.last_check = datetime.now()
-            self._q.put(("tally_status", connected))
-        except Exception as e:
-            self._q.put(("tally_status", False))
+        return True
 
     def _load_companies_from_db(self, engine):
         """
@@ -526,74 +640,115 @@ class TallySyncApp:
           - DB-only       → shown as Configured but flagged tally_open=False
           - Both          → Configured, tally_open=True
         """
-        from sqlalchemy.orm import sessionmaker
+        self._read_db_companies(engine)
+        self._merge_tally_companies(self._fetch_tally_companies())
+
+    def _read_db_companies(self, engine):
+        """Load DB companies into state, all flagged tally_open=False."""
+        from sqlalchemy import select
         from database.models.company    import Company
         from database.models.sync_state import SyncState
 
+        # Optional columns — probe the model once, not per company row
+        has_books      = hasattr(Company, 'books_from')
+        has_tally_host = hasattr(Company, 'tally_host')
+        has_tally_port = hasattr(Company, 'tally_port')
+
         # ── Step 1: Load DB companies ─────────────────────
-        Session = sessionmaker(bind=engine)
-        db      = Session()
-        try:
-            db_companies = {co.name: co for co in db.query(Company).all()}
-
-            for name, co in db_companies.items():
-                states = db.query(SyncState).filter_by(company_name=name).all()
-
-                last_sync  = None
-                last_alter = 0
-                is_initial = False
-                last_month = None
-
-                if states:
-                    times = [s.last_sync_time for s in states if s.last_sync_time]
-                    if times:
-                        last_sync = max(times)
-                    last_alter = max(s.last_alter_id for s in states)
-                    is_initial = all(s.is_initial_done for s in states)
-                    months     = [s.last_synced_month for s in states if s.last_synced_month]
-                    last_month = max(months) if months else None
-
-                from_str  = None
-                books_str = None
-                if co.starting_from:
-                    from_str  = str(co.starting_from).replace("-", "")[:8]
-                if hasattr(co, 'books_from') and co.books_from:
-                    books_str = str(co.books_from).replace("-", "")[:8]
+        # Read-only, so a Core SELECT … LEFT JOIN on a plain connection:
+        # one round-trip and no ORM identity-map hydration per row.
+        cols = [Company.name, Company.guid, Company.starting_from]
+        if has_books:
+            cols.append(Company.books_from)
+        if has_tally_host:
+            cols.append(Company.tally_host)
+        if has_tally_port:
+            cols.append(Company.tally_port)
+        stmt = (
+            select(
+                *cols,
+                SyncState.voucher_type,
+                SyncState.last_sync_time,
+                SyncState.last_alter_id,
+                SyncState.is_initial_done,
+                SyncState.last_synced_month,
+            )
+            .outerjoin(SyncState, SyncState.company_name == Company.name)
+        )
+        with engine.connect() as conn:
+            rows = conn.execute(stmt).mappings().all()
+
+        db_companies: dict[str, dict] = {}
+        buckets: dict[str, list]      = defaultdict(list)
+        for r in rows:
+            name = r["name"]
+            db_companies.setdefault(name, r)
+            if r["voucher_type"] is not None:
+                buckets[name].append(r)
+
+        for name, co in db_companies.items():
+            states = buckets.get(name)
+
+            last_sync  = None
+            last_alter = 0
+            is_initial = False
+            last_month = None
+
+            if states:
+                is_initial = True
+                for s in states:
+                    sync_time = s["last_sync_time"]
+                    if sync_time and (last_sync is None or sync_time > last_sync):
+                        last_sync = sync_time
+                    if s["last_alter_id"] > last_alter:
+                        last_alter = s["last_alter_id"]
+                    if not s["is_initial_done"]:
+                        is_initial = False
+                    month = s["last_synced_month"]
+                    if month and (last_month is None or month > last_month):
+                        last_month = month
+
+            cs = CompanyState(
+                name              = name,
+                guid              = co["guid"] or "",
+                status            = CompanyStatus.CONFIGURED,
+                last_sync_time    = last_sync,
+                last_alter_id     = last_alter,
+                last_synced_month = last_month,
+                is_initial_done   = is_initial,
+                starting_from     = _ymd(co["starting_from"]),
+                books_from        = _ymd(co["books_from"]) if has_books else None,
+                tally_host        = (has_tally_host and co["tally_host"]) or 'localhost',
+                tally_port        = int((has_tally_port and co["tally_port"]) or 9000),
+            )
+            # Mark as not open in Tally until we check below
+            cs.tally_open = False
+            self.state.companies[name] = cs
 
-                cs = CompanyState(
-                    name              = name,
-                    guid              = co.guid or "",
-                    status            = CompanyStatus.CONFIGURED,
-                    last_sync_time    = last_sync,
-                    last_alter_id     = last_alter,
-                    last_synced_month = last_month,
-                    is_initial_done   = is_initial,
-                    starting_from     = from_str,
-                    books_from        = books_str,
-                    tally_host        = getattr(co, 'tally_host', 'localhost') or 'localhost',
-                    tally_port        = int(getattr(co, 'tally_port', 9000) or 9000),
-                )
-                # Mark as not open in Tally until we check below
-                cs.tally_open = False
-                self.state.companies[name] = cs
-        finally:
-            db.close()
+    def _fetch_tally_companies(self, tally=None):
+        """
+        Return the live Tally company list, or [] when Tally is unreachable.
 
-        # ── Step 2: Fetch live Tally companies ────────────
+        *tally* is an existing TallyConnector to reuse (startup passes the
+        one from its ping); when omitted a fresh connector is opened.
+        """
         tally_companies = []
         try:
-            from services.tally_connector import TallyConnector
-            tally = TallyConnector(
-                host=self.state.tally.host,
-                port=self.state.tally.port,
-            )
+            if tally is None:
+                from services.tally_connector import TallyConnector
+                tally = TallyConnector(
+                    host=self.state.tally.host,
+                    port=self.state.tally.port,
+                )
             if tally.status == "Connected":
                 tally_companies = tally.fetch_all_companies()
         except Exception as e:
             from logging_config import logger
             logger.warning(f"[App] Could not fetch Tally company list: {e}")
+        return tally_companies
 
-        # ── Step 3: Merge Tally into state ────────────────
+    def _merge_tally_companies(self, tally_companies):
+        """Mark DB companies open in Tally and add the Tally-only ones."""
         tally_names = set()
         for tc in tally_companies:
             name = (tc.get("name") or "").strip()
@@ -604,8 +759,8 @@ class TallySyncApp:
             # Normalize Tally starting_from (YYYYMMDD)
             raw_from  = tc.get("starting_from", "")
             raw_books = tc.get("books_from", "")
-            from_str  = str(raw_from).replace("-", "")[:8]  if raw_from  else None
-            books_str = str(raw_books).replace("-", "")[:8] if raw_books else None
+            from_str  = _ymd(raw_from)
+            books_str = _ymd(raw_books)
 
             if name in self.state.companies:
                 # Already in DB — just mark as open in Tally
@@ -625,7 +780,7 @@ class TallySyncApp:
                 cs.tally_open = True
                 self.state.companies[name] = cs
 
-        # ── Step 4: Mark DB companies not currently open in Tally ─
+        # Mark DB companies not currently open in Tally
         for name, cs in self.state.companies.items():
             if not hasattr(cs, 'tally_open'):
                 cs.tally_open = False
@@ -636,15 +791,14 @@ class TallySyncApp:
         Insert or update a company record in the DB.
         Called after the user fills in the Configure dialog.
         """
-        from sqlalchemy.orm import sessionmaker
+        from database.database_processor import _get_session
         from database.models.company import Company
 
         engine = self.state.db_engine
         if not engine:
             return False, "No DB connection"
 
-        Session = sessionmaker(bind=engine)
-        db      = Session()
+        db = _get_session(engine)
         try:
             existing = db.query(Company).filter_by(name=company_name).first()
             if existing:
@@ -672,93 +826,174 @@ class TallySyncApp:
     # ─────────────────────────────────────────────────────────────────────────
     #  Queue polling — safely update GUI from background threads
     # ─────────────────────────────────────────────────────────────────────────
-    def _poll_queue(self):
-        """Called every 100ms to drain the queue and update the GUI."""
+    def _enable_wake(self):
+        """
+        Runs from the first mainloop iteration.  Before that a cross-thread
+        event_generate would stall the caller waiting for the mainloop, so
+        anything queued during startup is picked up here instead.
+        """
+        self._wake_ready = True
+        self._drain_queue()
+
+    def _wake(self):
+        """
+        Ask the Tk thread to drain the queue (called from any thread).
+
+        A cross-thread event_generate blocks the caller until the Tk thread
+        runs it, so only the first put since the last drain sends one; the
+        rest find _wake_pending set and return at once.  An unlocked check
+        can at worst send a spare event, which drains an empty queue.
+        """
+        if not self._wake_ready or self._wake_pending:
+            return
+        self._wake_pending = True
+        try:
+            self.root.event_generate("<<QueueMsg>>", when="tail")
+        except (RuntimeError, tk.TclError):
+            pass   # window gone / not in mainloop — the safety tick covers it
+
+    @staticmethod
+    def _coalesce_key(msg: tuple):
+        """
+        Messages that only report the latest state share a key; within one
+        drain only the newest of each key is handled.  None = always handle.
+        """
+        event = msg[0]
+        if event in ("db_status", "tally_status"):
+            return event
+        return None
+
+    def _drain_queue(self):
+        """
+        Handle every message currently in the queue, superseded states skipped.
+
+        Not re-entrant: handlers may open modal dialogs (messagebox,
+        wait_window) whose nested event loop fires <<QueueMsg>> again.  A
+        nested call just returns and the running drain picks the newer
+        messages up once the handler returns, so they stay in order.
+        """
+        if self._draining:
+            return
+        self._draining = True
         try:
             while True:
-                msg = self._q.get_nowait()
+                # Puts from here on must wake us again for anything this
+                # pass does not take.
+                self._wake_pending = False
+                msgs = []
+                try:
+                    while True:
+                        msgs.append(self._q.get_nowait())
+                except queue.Empty:
+                    pass
+                if not msgs:
+                    return
+                self._drain_batch(msgs)
+        finally:
+            self._draining = False
+
+    def _drain_batch(self, msgs: list):
+        """Dispatch one batch taken off the queue, in arrival order."""
+        keys   = [self._coalesce_key(msg) for msg in msgs]
+        newest = {key: i for i, key in enumerate(keys) if key is not None}
+        log_batch: list[str] = []
+        for i, (msg, key) in enumerate(zip(msgs, keys)):
+            if msg[0] == "sync_log":
+                log_batch.append(msg[1])
+                continue
+            # Lines queued before this message must reach the logs page first
+            if log_batch:
+                self._flush_logs(log_batch)
+                log_batch = []
+            if key is None or newest[key] == i:
                 self._handle_queue_msg(msg)
-        except queue.Empty:
-            pass
+        if log_batch:
+            self._flush_logs(log_batch)
+
+    def _flush_logs(self, lines: list[str]):
+        """Forward a run of consecutive sync_log lines in one Text update."""
+        logs_page = self._frames.get("logs")
+        if logs_page and logs_page._has_append_logs:
+            logs_page.append_logs(lines)
+
+    def _poll_queue(self):
+        """Safety tick: drain the queue in case a <<QueueMsg>> wakeup was missed."""
+        try:
+            self._drain_queue()
         finally:
-            self.root.after(100, self._poll_queue)
+            self.root.after(self.QUEUE_SAFETY_TICK_MS, self._poll_queue)
 
     def _handle_queue_msg(self, msg: tuple):
-        event = msg[0]
-
-        if event == "db_status":
-            _, ok, detail = msg
-            if ok:
-                self._db_status_lbl.configure(
-                    text=f"● DB: Connected",
-                    fg=Color.SUCCESS,
-                )
-            else:
-                self._db_status_lbl.configure(
-                    text=f"● DB: Error",
-                    fg=Color.DANGER,
-                )
-                messagebox.showerror(
-                    "Database Configuration Error",
-                    detail,
-                )
+        handler = self._handlers.get(msg[0])
+        if handler:
+            handler(msg)
+
+    # ── Queue message handlers (dispatched via self._handlers) ──
+    def _on_db_status(self, msg: tuple):
+        _, ok, detail = msg
+        if ok:
+            self._db_status_lbl.configure(
+                text=f"● DB: Connected",
+                fg=Color.SUCCESS,
+            )
+        else:
+            self._db_status_lbl.configure(
+                text=f"● DB: Error",
+                fg=Color.DANGER,
+            )
+            messagebox.showerror(
+                "Database Configuration Error",
+                detail,
+            )
 
-        elif event == "tally_status":
-            _, connected = msg
-            if connected:
-                self._tally_status_lbl.configure(
-                    text="● Tally: Online",
-                    fg=Color.SUCCESS,
-                )
-            else:
-                self._tally_status_lbl.configure(
-                    text="● Tally: Offline",
-                    fg=Color.DANGER,
-                )
+    def _on_tally_status(self, msg: tuple):
+        _, connected = msg
+        if connected:
+            self._tally_status_lbl.configure(
+                text="● Tally: Online",
+                fg=Color.SUCCESS,
+            )
+        else:
+            self._tally_status_lbl.configure(
+                text="● Tally: Offline",
+                fg=Color.DANGER,
+            )
 
-        elif event == "companies_loaded":
-            # Refresh the home page with the newly loaded companies
-            home = self._frames.get("home")
-            if home and hasattr(home, "refresh_companies"):
-                home.refresh_companies()
-
-            # Refresh the scheduler page so rows reflect current schedule config
-            # and next-run times are recalculated from the live APScheduler state.
-            sched_page = self._frames.get("scheduler")
-            if sched_page and hasattr(sched_page, "refresh_companies"):
-                sched_page.refresh_companies()
-
-        elif event == "error":
-            _, msg_text = msg
-            messagebox.showerror("Error", msg_text)
-
-        elif event == "sync_log":
-            # Forward log lines to logs page
-            _, line = msg
-            logs_page = self._frames.get("logs")
-            if logs_page and hasattr(logs_page, "append_log"):
-                logs_page.append_log(line)
-
-        elif event == "company_progress":
-            # Forward to home page progress bars
-            _, name, pct, label = msg
-            self.state.set_company_progress(name, pct, label)
-
-        elif event == "sync_done":
-            self.state.sync_active = False
-            self.state.emit("sync_finished")
-
-        elif event == "scheduler_updated":
-            _, company_name = msg
-            self.state.emit("scheduler_updated", company=company_name)
-
-        elif event == "scheduler_sync_done":
-            _, company_name = msg
-            self.state.emit("scheduler_updated", company=company_name)
-
-        elif event == "scheduler_job_error":
-            _, company_name, err = msg
-            self.state.set_company_status(company_name, CompanyStatus.SYNC_ERROR)
+    def _on_companies_loaded(self, msg: tuple):
+        # Refresh the home page with the newly loaded companies
+        home = self._frames.get("home")
+        if home and home._has_refresh:
+            home.refresh_companies()
+
+        # Refresh the scheduler page so rows reflect current schedule config
+        # and next-run times are recalculated from the live APScheduler state.
+        sched_page = self._frames.get("scheduler")
+        if sched_page and sched_page._has_refresh:
+            sched_page.refresh_companies()
+
+    def _on_tally_companies(self, msg: tuple):
+        # Startup merges the Tally list here, on the GUI thread, because the
+        # home page may already be drawing the DB companies.
+        _, tally_companies = msg
+        self._merge_tally_companies(tally_companies)
+        self._on_companies_loaded(msg)
+
+    def _on_error(self, msg: tuple):
+        _, msg_text = msg
+        messagebox.showerror("Error", msg_text)
+
+    def _on_sync_done(self, msg: tuple):
+        self.state.sync_active = False
+        self.state.emit("sync_finished")
+
+    def _on_sched_updated(self, msg: tuple):
+        # scheduler_updated and scheduler_sync_done both refresh the row
+        _, company_name = msg
+        self.state.emit("scheduler_updated", company=company_name)
+
+    def _on_sched_error(self, msg: tuple):
+        _, company_name, err = msg
+        self.state.set_company_status(company_name, CompanyStatus.SYNC_ERROR)
 
     # ─────────────────────────────────────────────────────────────────────────
     #  Public helper — post to queue from any thread
@@ -838,8 +1073,6 @@ class TallySyncApp:
         Reads current values from .env (via _load_db_config),
         shows the dialog, then writes changes back to .env.
         """
-        import os
-
         # Pre-fill from current .env (or fall back to defaults if missing)
         defaults = {
             "host": "localhost", "port": "3306",
@@ -861,9 +1094,7 @@ class TallySyncApp:
 
             # Resolve absolute path the same way _load_db_config does
             if not os.path.isabs(env_path):
-                alt = os.path.join(
-                    os.path.dirname(os.path.abspath(__file__)), env_path
-                )
+                alt = self._ENV_ALT
                 if os.path.exists(alt) or not os.path.exists(env_path):
                     env_path = alt
 
@@ -907,6 +1138,7 @@ class DBConfigDialog(tk.Toplevel):
         self.result = None
 
         self._vars = {}
+        self._test_seq = 0           # bumped per Test click; stale results dropped
         self._build(defaults)
 
         # Center over parent
@@ -916,15 +1148,13 @@ class DBConfigDialog(tk.Toplevel):
         self.geometry(f"+{pw - 210}+{ph - 180}")
 
     def _build(self, defaults: dict):
-        from gui.styles import Color, Font, Spacing
-
         pad = tk.Frame(self, bg=Color.BG_CARD, padx=30, pady=24)
         pad.pack(fill="both", expand=True)
 
         tk.Label(
             pad, text="MySQL / MariaDB Connection",
             font=Font.HEADING_4, bg=Color.BG_CARD, fg=Color.TEXT_PRIMARY,
-        ).grid(row=0, column=0, columnspan=2, sticky="w", pady=(0, 16))
+        ).pack(anchor="w", pady=(0, 16))
 
         fields = [
             ("Host",     "host",     False),
@@ -934,37 +1164,35 @@ class DBConfigDialog(tk.Toplevel):
             ("Database", "database", False),
         ]
 
-        for i, (label, key, secret) in enumerate(fields, start=1):
-            tk.Label(
-                pad, text=f"{label}:",
-                font=Font.BODY, bg=Color.BG_CARD, fg=Color.TEXT_SECONDARY,
-                anchor="w", width=10,
-            ).grid(row=i, column=0, sticky="w", pady=4)
+        # Shared widget options, built once for all five rows
+        lbl_kw = dict(font=Font.BODY, bg=Color.BG_CARD, fg=Color.TEXT_SECONDARY,
+                      anchor="w", width=10)
+        ent_kw = dict(font=Font.BODY, width=26, bg=Color.BG_INPUT,
+                      fg=Color.TEXT_PRIMARY, relief="solid", bd=1)
+
+        # One packed Frame per row — no shared grid to re-solve across rows
+        for label, key, secret in fields:
+            row = tk.Frame(pad, bg=Color.BG_CARD)
+            row.pack(fill="x", pady=4)
+
+            tk.Label(row, text=f"{label}:", **lbl_kw).pack(side="left")
 
             var = tk.StringVar(value=defaults.get(key, ""))
             self._vars[key] = var
 
-            entry = tk.Entry(
-                pad, textvariable=var,
-                font=Font.BODY, width=26,
-                bg=Color.BG_INPUT, fg=Color.TEXT_PRIMARY,
-                relief="solid", bd=1,
-                show="●" if secret else "",
-            )
-            entry.grid(row=i, column=1, sticky="ew", pady=4, padx=(8, 0))
+            tk.Entry(row, textvariable=var, show="●" if secret else "", **ent_kw).pack(
+                side="left", fill="x", expand=True, padx=(8, 0))
 
         # Test connection feedback
         self._feedback = tk.Label(
             pad, text="", font=Font.BODY_SM,
             bg=Color.BG_CARD, fg=Color.TEXT_MUTED,
         )
-        self._feedback.grid(row=len(fields)+1, column=0, columnspan=2,
-                            sticky="w", pady=(8, 0))
+        self._feedback.pack(anchor="w", pady=(8, 0))
 
         # Buttons
         btn_row = tk.Frame(pad, bg=Color.BG_CARD)
-        btn_row.grid(row=len(fields)+2, column=0, columnspan=2,
-                     sticky="ew", pady=(16, 0))
+        btn_row.pack(fill="x", pady=(16, 0))
 
         tk.Button(
             btn_row, text="Test Connection",
@@ -995,30 +1223,44 @@ class DBConfigDialog(tk.Toplevel):
         return {k: v.get().strip() for k, v in self._vars.items()}
 
     def _on_test(self):
-        self._feedback.configure(text="Testing...", fg=Color.TEXT_MUTED if True else "")
-        self.update_idletasks()
-        try:
-            from gui.styles import Color
-            from database.db_connector import DatabaseConnector
-            cfg = self._collect()
-            conn = DatabaseConnector(
-                username=cfg["username"], password=cfg["password"],
-                host=cfg["host"],        port=int(cfg["port"]),
-                database=cfg["database"],
-            )
-            ok = conn.test_connection()
-            if ok:
-                self._feedback.configure(text="✓ Connection successful!", fg=Color.SUCCESS)
-            else:
-                self._feedback.configure(text="✗ Connection failed — check credentials.", fg=Color.DANGER)
-        except Exception as e:
-            from gui.styles import Color
-            self._feedback.configure(text=f"✗ {e}", fg=Color.DANGER)
+        """Run test_connection on a worker thread so the dialog stays responsive."""
+        cfg = self._collect()
+        self._test_seq += 1
+        seq = self._test_seq
+        self._feedback.configure(text="Testing...", fg=Color.TEXT_MUTED)
+
+        def worker():
+            try:
+                from database.db_connector import DatabaseConnector
+                conn = DatabaseConnector(
+                    username=cfg["username"], password=cfg["password"],
+                    host=cfg["host"],        port=int(cfg["port"]),
+                    database=cfg["database"],
+                )
+                ok, err = conn.test_connection(), None
+            except Exception as e:
+                ok, err = False, str(e)
+            try:
+                self.after(0, lambda: self._on_test_result(seq, ok, err))
+            except (RuntimeError, tk.TclError):
+                pass   # dialog closed while testing
+
+        threading.Thread(target=worker, daemon=True).start()
+
+    def _on_test_result(self, seq: int, ok: bool, err: str = None):
+        # Drop results from an earlier click or a dialog closed meanwhile
+        if seq != self._test_seq or not self.winfo_exists():
+            return
+        if err:
+            self._feedback.configure(text=f"✗ {err}", fg=Color.DANGER)
+        elif ok:
+            self._feedback.configure(text="✓ Connection successful!", fg=Color.SUCCESS)
+        else:
+            self._feedback.configure(text="✗ Connection failed — check credentials.", fg=Color.DANGER)
 
     def _on_save(self):
         cfg = self._collect()
         if not cfg.get("host") or not cfg.get("database"):
-            from gui.styles import Color
             self._feedback.configure(text="Host and Database are required.", fg=Color.DANGER)
             return
         self.result = cfg
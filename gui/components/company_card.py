@@ -17,7 +17,9 @@ Not-configured (Tally-only) companies:
 """
 
 import tkinter as tk
+from collections import deque
 from datetime import datetime
+from functools import lru_cache
 from typing import Callable
 
 from gui.state  import CompanyState, CompanyStatus
@@ -25,6 +27,79 @@ from gui.styles import Color, Font, Spacing, STATUS_STYLE
 from gui.components.status_badge import StatusBadge
 
 
+# Label options shared by every card, built once at import
+_BADGE_STYLE       = dict(font=Font.BADGE, padx=5, pady=1)
+_BODY_SM_STYLE     = dict(font=Font.BODY_SM, bg=Color.BG_CARD, fg=Color.TEXT_SECONDARY)
+_META_STYLE        = dict(_BODY_SM_STYLE, anchor="w")
+_META_MUTED_STYLE  = dict(_META_STYLE, fg=Color.TEXT_MUTED)
+# Never recoloured on hover, whatever their bg: the status badge paints its
+# own colours and the action buttons keep theirs.
+_NO_HOVER_TYPES    = (StatusBadge, tk.Button)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Shared checkbox images — one set per Tk interpreter, reused by every card
+# ─────────────────────────────────────────────────────────────────────────────
+_CHK_SIZE   = 14
+_CHK_TICK   = ((3, 7), (4, 8), (5, 9), (6, 8), (7, 7), (8, 6), (9, 5), (10, 4))
+_CHK_IMAGES: dict = {}
+
+
+def _checkbox_images(master) -> dict:
+    """Return {'on', 'off', 'disabled'} PhotoImages, drawn once per interpreter."""
+    imgs = _CHK_IMAGES.get(master.tk)
+    if imgs is None:
+        n = _CHK_SIZE
+
+        def box(border, fill):
+            img = tk.PhotoImage(master=master, width=n, height=n)
+            img.put(border, to=(0, 0, n, n))
+            img.put(fill,   to=(1, 1, n - 1, n - 1))
+            return img
+
+        on = box(Color.PRIMARY, Color.PRIMARY)
+        for x, y in _CHK_TICK:
+            on.put(Color.TEXT_WHITE, to=(x, y, x + 2, y + 2))
+        imgs = _CHK_IMAGES[master.tk] = {
+            "on":       on,
+            "off":      box(Color.TEXT_MUTED, Color.BG_INPUT),
+            "disabled": box(Color.BORDER,     Color.BG_ROOT),
+        }
+    return imgs
+
+
+# Card lists re-render the same handful of timestamps / dates on every
+# refresh, so the formatted strings are memoised.
+_MONTHS = ("Jan", "Feb", "Mar", "Apr", "May", "Jun",
+           "Jul", "Aug", "Sep", "Oct", "Nov", "Dec")
+
+
+@lru_cache(maxsize=1024)
+def _fmt_sync_time(dt) -> str:
+    if not dt:
+        return "Never"
+    try:
+        if isinstance(dt, str):
+            dt = datetime.fromisoformat(dt)
+        # Fixed "%d %b %Y  %H:%M" layout, formatted without strftime/locale
+        return (f"{dt.day:02d} {_MONTHS[dt.month - 1]} {dt.year}  "
+                f"{getattr(dt, 'hour', 0):02d}:{getattr(dt, 'minute', 0):02d}")
+    except Exception:
+        return str(dt)
+
+
+@lru_cache(maxsize=1024)
+def _fmt_date_str(s: str) -> str:
+    # Input is always YYYYMMDD — slice it rather than run strptime
+    t = str(s)
+    if len(t) < 8 or not t[:8].isdigit():
+        return t
+    m, d = int(t[4:6]), int(t[6:8])
+    if not (1 <= m <= 12 and 1 <= d <= 31):
+        return t
+    return f"{d:02d} {_MONTHS[m - 1]} {t[0:4]}"
+
+
 class CompanyCard(tk.Frame):
 
     def __init__(
@@ -44,12 +119,14 @@ class CompanyCard(tk.Frame):
         self.on_sync      = on_sync
         self.on_schedule  = on_schedule
         self.on_configure = on_configure
-        self._selected_var = tk.BooleanVar(value=selected)
-        self._bg_frames    = []
+        self._selected     = bool(selected)
+        self._hover_targets = None   # card-bg widgets, found on first hover
+        self._prog_wrap    = None
         self._prog_lbl     = None
         self._prog_canvas  = None
         self._prog_bar     = None
         self._meta_lbl     = None
+        self._meta_tail    = None    # configured cards: meta parts after "Last sync"
         self._build()
         self._bind_hover()
 
@@ -62,29 +139,28 @@ class CompanyCard(tk.Frame):
         outer = tk.Frame(self, bg=Color.BG_CARD, padx=Spacing.LG, pady=10)
         outer.pack(fill="x")
         outer.columnconfigure(1, weight=1)
-        self._bg_frames = [self, outer]
 
         # ── Checkbox ──────────────────────────────────────
+        # A Label showing one of the shared checkbox images — far cheaper
+        # per card than a native Checkbutton + BooleanVar.
         # NOT_CONFIGURED companies cannot be selected for Sync/Schedule —
-        # show a disabled, always-unchecked checkbox to make this clear.
-        chk = tk.Checkbutton(
+        # show a disabled, always-unchecked box to make this clear.
+        self._chk_imgs = _checkbox_images(self)
+        chk = tk.Label(
             outer,
-            variable=self._selected_var,
+            image=self._chk_image(),
             bg=Color.BG_CARD,
-            activebackground=Color.BG_CARD,
-            disabledforeground=Color.TEXT_MUTED,
-            relief="flat", bd=0,
-            command=self._on_toggle,
-            state="disabled" if not is_configured else "normal",
+            bd=0,
+            cursor="hand2" if is_configured else "",
         )
         chk.grid(row=0, column=0, rowspan=2, sticky="ns", padx=(0, Spacing.MD))
-        self._chk = chk   # keep ref so set_selected() can skip it when disabled
-        self._bg_frames.append(chk)
+        if is_configured:
+            chk.bind("<Button-1>", self._on_toggle)
+        self._chk = chk   # keep ref so set_selected() can swap its image
 
         # ── Company name row ──────────────────────────────
         name_row = tk.Frame(outer, bg=Color.BG_CARD)
         name_row.grid(row=0, column=1, sticky="ew")
-        self._bg_frames.append(name_row)
 
         self._name_lbl = tk.Label(
             name_row, text=co.name,
@@ -93,90 +169,60 @@ class CompanyCard(tk.Frame):
             anchor="w",
         )
         self._name_lbl.pack(side="left")
-        self._bg_frames.append(self._name_lbl)
 
         # Tally open/offline pill
         if tally_open:
             tp = tk.Label(
                 name_row, text="● Tally",
-                font=Font.BADGE,
-                bg=Color.SUCCESS_BG, fg=Color.SUCCESS_FG,
-                padx=5, pady=1,
+                bg=Color.SUCCESS_BG, fg=Color.SUCCESS_FG, **_BADGE_STYLE,
             )
             tp.pack(side="left", padx=(Spacing.SM, 0))
-            self._bg_frames.append(tp)
         elif is_configured:
             tp = tk.Label(
                 name_row, text="○ Tally offline",
-                font=Font.BADGE,
-                bg=Color.MUTED_BG, fg=Color.MUTED_FG,
-                padx=5, pady=1,
+                bg=Color.MUTED_BG, fg=Color.MUTED_FG, **_BADGE_STYLE,
             )
             tp.pack(side="left", padx=(Spacing.SM, 0))
-            self._bg_frames.append(tp)
 
         # Scheduled pill
         if co.schedule_enabled:
             sp = tk.Label(
                 name_row, text="⏰ Scheduled",
-                font=Font.BADGE, bg=Color.INFO_BG, fg=Color.INFO_FG,
-                padx=5, pady=1,
+                bg=Color.INFO_BG, fg=Color.INFO_FG, **_BADGE_STYLE,
             )
             sp.pack(side="left", padx=(Spacing.SM, 0))
-            self._bg_frames.append(sp)
 
         # Initial snapshot badge (configured companies only)
         if is_configured:
             if co.is_initial_done:
                 snap_badge = tk.Label(
                     name_row, text="✓ Snapshot",
-                    font=Font.BADGE,
-                    bg=Color.SUCCESS_BG, fg=Color.SUCCESS_FG,
-                    padx=5, pady=1,
+                    bg=Color.SUCCESS_BG, fg=Color.SUCCESS_FG, **_BADGE_STYLE,
                 )
             else:
                 snap_badge = tk.Label(
                     name_row, text="⚠ No Snapshot",
-                    font=Font.BADGE,
-                    bg=Color.WARNING_BG, fg=Color.WARNING_FG,
-                    padx=5, pady=1,
+                    bg=Color.WARNING_BG, fg=Color.WARNING_FG, **_BADGE_STYLE,
                 )
             snap_badge.pack(side="left", padx=(Spacing.SM, 0))
-            self._bg_frames.append(snap_badge)
 
         # ── Meta row ─────────────────────────────────────
         meta = tk.Frame(outer, bg=Color.BG_CARD)
         meta.grid(row=1, column=1, sticky="ew", pady=(2, 0))
-        self._bg_frames.append(meta)
 
         if is_configured:
+            # One label for the whole row; update_sync_time() swaps only
+            # the "Last sync" part and keeps the tail.
+            tail = []
+            if co.last_alter_id:
+                tail.append(f"alter_id: {co.last_alter_id:,}")
+            if co.starting_from:
+                tail.append(f"Books from: {self._fmt_date_str(co.starting_from)}")
+            self._meta_tail = tail
             self._meta_lbl = tk.Label(
-                meta, text=f"Last sync: {self._fmt_sync_time(co.last_sync_time)}",
-                font=Font.BODY_SM, bg=Color.BG_CARD,
-                fg=Color.TEXT_SECONDARY, anchor="w",
+                meta, text=self._meta_text(co.last_sync_time), **_META_STYLE,
             )
             self._meta_lbl.pack(side="left")
-            self._bg_frames.append(self._meta_lbl)
-
-            if co.last_alter_id:
-                for w in (
-                    tk.Label(meta, text="  ·  ", font=Font.BODY_SM,
-                             bg=Color.BG_CARD, fg=Color.TEXT_MUTED),
-                    tk.Label(meta, text=f"alter_id: {co.last_alter_id:,}",
-                             font=Font.BODY_SM, bg=Color.BG_CARD, fg=Color.TEXT_MUTED),
-                ):
-                    w.pack(side="left")
-                    self._bg_frames.append(w)
-
-            if co.starting_from:
-                for w in (
-                    tk.Label(meta, text="  ·  ", font=Font.BODY_SM,
-                             bg=Color.BG_CARD, fg=Color.TEXT_MUTED),
-                    tk.Label(meta, text=f"Books from: {self._fmt_date_str(co.starting_from)}",
-                             font=Font.BODY_SM, bg=Color.BG_CARD, fg=Color.TEXT_MUTED),
-                ):
-                    w.pack(side="left")
-                    self._bg_frames.append(w)
         else:
             # Not configured — show hint from Tally data
             parts = []
@@ -186,18 +232,14 @@ class CompanyCard(tk.Frame):
             parts.append("Click Configure to add this company")
 
             self._meta_lbl = tk.Label(
-                meta, text="  ·  ".join(parts),
-                font=Font.BODY_SM, bg=Color.BG_CARD,
-                fg=Color.TEXT_MUTED, anchor="w",
+                meta, text="  ·  ".join(parts), **_META_MUTED_STYLE,
             )
             self._meta_lbl.pack(side="left")
-            self._bg_frames.append(self._meta_lbl)
 
         # ── Status badge ──────────────────────────────────
         badge_wrap = tk.Frame(outer, bg=Color.BG_CARD)
         badge_wrap.grid(row=0, column=2, rowspan=2,
                         padx=(Spacing.LG, Spacing.MD), sticky="ns")
-        self._bg_frames.append(badge_wrap)
         self._badge = StatusBadge(badge_wrap, status=co.status)
         self._badge.pack(anchor="center", expand=True)
 
@@ -206,30 +248,14 @@ class CompanyCard(tk.Frame):
         prog_wrap.grid(row=0, column=3, rowspan=2,
                        padx=(0, Spacing.MD), sticky="ns")
         prog_wrap.grid_propagate(False)
-        self._bg_frames.append(prog_wrap)
 
-        if is_configured:
-            self._prog_lbl = tk.Label(
-                prog_wrap, text="", font=Font.BODY_SM,
-                bg=Color.BG_CARD, fg=Color.TEXT_SECONDARY,
-            )
-            self._prog_lbl.pack(anchor="w")
-            self._bg_frames.append(self._prog_lbl)
-
-            self._prog_canvas = tk.Canvas(
-                prog_wrap, height=6, width=130,
-                bg=Color.PROGRESS_BG, highlightthickness=0, bd=0,
-            )
-            self._prog_canvas.pack(anchor="w", pady=(2, 0))
-            self._prog_bar = self._prog_canvas.create_rectangle(
-                0, 0, 0, 6, fill=Color.PROGRESS_FILL, width=0,
-            )
-            self._bg_frames.append(self._prog_canvas)
+        # The label + bar are only built on the first update_progress();
+        # until a sync starts the column is just this fixed-width spacer.
+        self._prog_wrap = prog_wrap if is_configured else None
 
         # ── Action buttons ────────────────────────────────
         btn_wrap = tk.Frame(outer, bg=Color.BG_CARD)
         btn_wrap.grid(row=0, column=4, rowspan=2, sticky="ns")
-        self._bg_frames.append(btn_wrap)
 
         if is_configured:
             self._sync_btn = tk.Button(
@@ -271,35 +297,91 @@ class CompanyCard(tk.Frame):
             ).pack()
 
     # ─────────────────────────────────────────────────────────────────────────
+    def _walk(self, prune=()) -> list:
+        """
+        Every widget in this card, self included (breadth-first), minus the
+        subtrees rooted at instances of the *prune* types.
+        """
+        found = []
+        todo  = deque([self])
+        while todo:
+            w = todo.popleft()
+            if isinstance(w, prune):
+                continue
+            found.append(w)
+            todo.extend(w.winfo_children())
+        return found
+
     def _bind_hover(self):
         def on_enter(e):
-            for w in self._bg_frames:
-                try: w.configure(bg=Color.BG_CARD_HOVER)
-                except Exception: pass
-            if self._prog_canvas:
-                self._prog_canvas.configure(bg=Color.BG_CARD_HOVER)
+            if self._hover_targets is None:
+                self._collect_hover_targets()
+            try: self.tk.eval(self._hover_script)
+            except tk.TclError: pass
 
         def on_leave(e):
-            for w in self._bg_frames:
-                try: w.configure(bg=Color.BG_CARD)
-                except Exception: pass
-            if self._prog_canvas:
-                self._prog_canvas.configure(bg=Color.BG_CARD)
-
-        for w in [self] + self._bg_frames:
+            if self._hover_targets is None:
+                return
+            try: self.tk.eval(self._idle_script)
+            except tk.TclError: pass
+
+        # One binding per event on a per-card tag; every widget in the card
+        # just carries the tag in its bindtags instead of its own bindings.
+        self._hover_tag = f"Card{id(self)}"
+        self.bind_class(self._hover_tag, "<Enter>", on_enter)
+        self.bind_class(self._hover_tag, "<Leave>", on_leave)
+        self._bind_hover_to(self._walk())
+
+    def _bind_hover_to(self, widgets):
+        tag = self._hover_tag
+        for w in widgets:
+            w.bindtags((tag,) + w.bindtags())
+
+    def destroy(self):
+        # Class bindings outlive widgets — drop this card's tag with it
+        tag = getattr(self, "_hover_tag", None)
+        if tag:
+            self.unbind_class(tag, "<Enter>")
+            self.unbind_class(tag, "<Leave>")
+        super().destroy()
+
+    def _collect_hover_targets(self):
+        """
+        Cache the widgets painted with the card background — pills and the
+        progress track keep their own colours, and the status badge and
+        buttons (_NO_HOVER_TYPES) are skipped outright — plus one Tcl script
+        per colour so a hover repaints them all in a single eval.
+        """
+        # Either card colour — a re-scan can happen while already hovered
+        card_bgs = {Color.BG_CARD.lower(), Color.BG_CARD_HOVER.lower()}
+        targets  = []
+        for w in self._walk(prune=_NO_HOVER_TYPES):
             try:
-                w.bind("<Enter>", on_enter)
-                w.bind("<Leave>", on_leave)
-            except Exception:
+                if str(w.cget("bg")).lower() in card_bgs:
+                    targets.append(w)
+            except tk.TclError:
                 pass
+        self._hover_targets = targets
+
+        def script(bg):
+            return "\n".join(f"{w._w} configure -bg {{{bg}}}" for w in targets)
+        self._hover_script = script(Color.BG_CARD_HOVER)
+        self._idle_script  = script(Color.BG_CARD)
 
     # ─────────────────────────────────────────────────────────────────────────
-    def _on_toggle(self):
-        # Extra safety — should never fire for disabled checkboxes, but guard anyway
+    def _chk_image(self):
+        if self.company.status == CompanyStatus.NOT_CONFIGURED:
+            return self._chk_imgs["disabled"]
+        return self._chk_imgs["on" if self._selected else "off"]
+
+    def _on_toggle(self, e=None):
+        # Extra safety — never bound for disabled checkboxes, but guard anyway
         if self.company.status == "Not Configured":
-            self._selected_var.set(False)
+            self._selected = False
             return
-        self.on_select(self.company.name, self._selected_var.get())
+        self._selected = not self._selected
+        self._chk.configure(image=self._chk_image())
+        self.on_select(self.company.name, self._selected)
 
     def _on_sync_click(self):
         self.on_sync(self.company.name)
@@ -317,44 +399,68 @@ class CompanyCard(tk.Frame):
     def update_status(self, status: str):
         self._badge.set_status(status)
 
+    def _build_progress(self):
+        """Create the progress label + bar the first time progress is shown."""
+        self._prog_lbl = tk.Label(
+            self._prog_wrap, text="", **_BODY_SM_STYLE,
+        )
+        self._prog_lbl.pack(anchor="w")
+
+        self._prog_canvas = tk.Canvas(
+            self._prog_wrap, height=6, width=130,
+            bg=Color.PROGRESS_BG, highlightthickness=0, bd=0,
+        )
+        self._prog_canvas.pack(anchor="w", pady=(2, 0))
+        self._prog_bar = self._prog_canvas.create_rectangle(
+            0, 0, 0, 6, fill=Color.PROGRESS_FILL, width=0,
+        )
+        self._bind_hover_to((self._prog_lbl, self._prog_canvas))
+        self._hover_targets = None     # re-scan on next hover
+
     def update_progress(self, pct: float, label: str = ""):
         if not self._prog_canvas:
-            return
+            if not self._prog_wrap:
+                return
+            if pct <= 0 and not label:
+                return      # nothing to show yet — stay unbuilt
+            self._build_progress()
         self._prog_lbl.configure(text=label or (f"{pct:.0f}%" if pct > 0 else ""))
         bar_w = int(130 * min(pct, 100) / 100)
         fill  = Color.PROGRESS_SUCCESS if pct >= 100 else Color.PROGRESS_FILL
         self._prog_canvas.coords(self._prog_bar, 0, 0, bar_w, 6)
         self._prog_canvas.itemconfig(self._prog_bar, fill=fill)
 
+    def _meta_text(self, dt) -> str:
+        return "  ·  ".join([f"Last sync: {self._fmt_sync_time(dt)}", *self._meta_tail])
+
     def update_sync_time(self, dt):
-        if self._meta_lbl:
-            self._meta_lbl.configure(text=f"Last sync: {self._fmt_sync_time(dt)}")
+        if self._meta_lbl and self._meta_tail is not None:
+            self._meta_lbl.configure(text=self._meta_text(dt))
 
     def set_selected(self, value: bool):
         # NOT_CONFIGURED companies are never selectable — skip silently
         if self.company.status == "Not Configured":
-            self._selected_var.set(False)
+            self._selected = False
             return
-        self._selected_var.set(value)
+        value = bool(value)
+        if value != self._selected:
+            self._selected = value
+            self._chk.configure(image=self._chk_image())
 
     def is_selected(self) -> bool:
-        return self._selected_var.get()
+        return self._selected
 
     # ─────────────────────────────────────────────────────────────────────────
     @staticmethod
     def _fmt_sync_time(dt) -> str:
-        if not dt:
-            return "Never"
         try:
-            if isinstance(dt, str):
-                dt = datetime.fromisoformat(dt)
-            return dt.strftime("%d %b %Y  %H:%M")
-        except Exception:
-            return str(dt)
+            return _fmt_sync_time(dt)
+        except TypeError:      # unhashable input — format uncached
+            return _fmt_sync_time.__wrapped__(dt)
 
     @staticmethod
     def _fmt_date_str(s: str) -> str:
         try:
-            return datetime.strptime(str(s)[:8], "%Y%m%d").strftime("%d %b %Y")
-        except Exception:
-            return str(s)
\ No newline at end of file
+            return _fmt_date_str(s)
+        except TypeError:      # unhashable input — format uncached
+            return _fmt_date_str.__wrapped__(s)
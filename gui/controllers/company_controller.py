@@ -12,9 +12,10 @@ Replaces the old scheduler_config.json flat-file approach.
 from datetime import datetime, timedelta
 from typing import Optional
 
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy import func
 from sqlalchemy.dialects.mysql import insert as mysql_insert
 
+from database.database_processor import _get_session
 from gui.state import AppState, CompanyState
 from logging_config import logger
 
@@ -38,29 +39,42 @@ class CompanyController:
         Read company_scheduler_config table and apply to matching CompanyState
         objects in state.companies.  Safe to call even if table is empty.
         """
+        rows = self.fetch_scheduler_config()
+        if rows is not None:
+            self.apply_scheduler_config(rows)
+
+    def fetch_scheduler_config(self) -> Optional[list]:
+        """
+        SELECT every company_scheduler_config row without touching state, so
+        startup can run it while companies are still loading.
+        Returns None when there is no engine or the query fails.
+        """
         engine = self._state.db_engine
         if not engine:
             logger.warning("[CompanyController] No DB engine — cannot load scheduler config")
-            return
+            return None
 
-        Model   = _get_model()
-        Session = sessionmaker(bind=engine)
-        db      = Session()
+        Model = _get_model()
+        db    = _get_session(engine)
         try:
-            rows = db.query(Model).all()
-            for row in rows:
-                co = self._state.companies.get(row.company_name)
-                if co:
-                    co.schedule_enabled  = bool(row.enabled)
-                    co.schedule_interval = row.interval or "hourly"
-                    co.schedule_value    = int(row.value  or 1)
-                    co.schedule_time     = row.time       or "09:00"
-            logger.info(f"[CompanyController] Loaded scheduler config for {len(rows)} companies")
+            return db.query(Model).all()
         except Exception as e:
             logger.error(f"[CompanyController] Failed to load scheduler config: {e}")
+            return None
         finally:
             db.close()
 
+    def apply_scheduler_config(self, rows: list):
+        """Copy fetched scheduler rows onto the matching CompanyState objects."""
+        for row in rows:
+            co = self._state.companies.get(row.company_name)
+            if co:
+                co.schedule_enabled  = bool(row.enabled)
+                co.schedule_interval = row.interval or "hourly"
+                co.schedule_value    = int(row.value  or 1)
+                co.schedule_time     = row.time       or "09:00"
+        logger.info(f"[CompanyController] Loaded scheduler config for {len(rows)} companies")
+
     # ─────────────────────────────────────────────────────────────────────────
     #  Save one company  state → DB  (upsert)
     # ─────────────────────────────────────────────────────────────────────────
@@ -105,9 +119,8 @@ class CompanyController:
         INSERT … ON DUPLICATE KEY UPDATE for one company row.
         Works correctly whether the row already exists or not.
         """
-        Model   = _get_model()
-        Session = sessionmaker(bind=engine)
-        db      = Session()
+        Model = _get_model()
+        db    = _get_session(engine)
         try:
             stmt = (
                 mysql_insert(Model)
@@ -117,14 +130,14 @@ class CompanyController:
                     interval     = co.schedule_interval,
                     value        = co.schedule_value,
                     time         = co.schedule_time,
-                    updated_at   = datetime.utcnow(),
+                    updated_at   = func.now(),
                 )
                 .on_duplicate_key_update(
                     enabled    = co.schedule_enabled,
                     interval   = co.schedule_interval,
                     value      = co.schedule_value,
                     time       = co.schedule_time,
-                    updated_at = datetime.utcnow(),
+                    updated_at = func.now(),
                 )
             )
             db.execute(stmt)
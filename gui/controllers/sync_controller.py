@@ -251,6 +251,10 @@ class SyncController:
             from services.sync_service import (
                 VOUCHER_CONFIG, _sync_ledgers, _sync_items, _sync_trial_balance, _sync_voucher
             )
+            from database.database_processor import get_sync_states
+
+            # Every selected entity's sync state in one SELECT
+            states = get_sync_states(company_name, engine)
 
             # Ledgers (special — always done first if selected)
             if "ledger" in selected:
@@ -258,7 +262,7 @@ class SyncController:
                     raise InterruptedError("Cancelled")
                 self._post("progress", company_name, 10.0, "Syncing ledgers...")
                 self._post("log",      company_name, "→ Ledgers", "INFO")
-                _sync_ledgers(company_name, tally, engine)
+                _sync_ledgers(company_name, tally, engine, states)
                 done_steps += 1
                 pct = 10 + (done_steps / total_steps) * 80
                 self._post("progress", company_name, pct, "Ledgers done")
@@ -271,7 +275,7 @@ class SyncController:
                 pct = 10 + (done_steps / max(total_steps, 1)) * 80
                 self._post("progress", company_name, pct, "Syncing items...")
                 self._post("log",      company_name, "→ Items (StockItem master)", "INFO")
-                _sync_items(company_name, tally, engine)
+                _sync_items(company_name, tally, engine, states)
                 done_steps += 1
                 self._post("log", company_name, "✓ Items done", "SUCCESS")
 
@@ -283,7 +287,7 @@ class SyncController:
                 self._post("progress", company_name, pct, "Syncing trial balance...")
                 self._post("log",      company_name, "→ Trial Balance", "INFO")
                 fd = from_date or company_dict.get('starting_from', '20240401')
-                _sync_trial_balance(company_name, tally, engine, fd, to_date)
+                _sync_trial_balance(company_name, tally, engine, fd, to_date, states)
                 done_steps += 1
                 self._post("log", company_name, "✓ Trial Balance done", "SUCCESS")
 
@@ -312,6 +316,7 @@ class SyncController:
                     engine       = engine,
                     from_date    = fd,
                     to_date      = to_date,
+                    states       = states,
                 )
 
                 done_steps += 1
@@ -212,19 +212,23 @@ class LogTextWidget(tk.Frame):
 
         self._update_status()
 
-    def append_lines(self, lines: list[str]):
+    def append_lines(self, lines: list[str], tags: list[str] = None):
         """Bulk append — more efficient than calling append_line() repeatedly."""
         self._all_lines.extend(lines)
         if len(self._all_lines) > MAX_LIVE_LINES:
             self._all_lines = self._all_lines[-MAX_LIVE_LINES:]
 
-        self._text.configure(state="normal")
-        for line in lines:
+        # Text.insert takes (chars, tags) pairs — one Tcl call for the batch
+        chunks = []
+        for i, line in enumerate(lines):
             if self._passes_filter(line):
-                tag = _level_tag(line)
-                self._text.insert("end", line + "\n", tag)
-                self._line_count += 1
-        self._text.configure(state="disabled")
+                chunks.append(line + "\n")
+                chunks.append(tags[i] if tags else _level_tag(line))
+        if chunks:
+            self._text.configure(state="normal")
+            self._text.insert("end", *chunks)
+            self._line_count += len(chunks) // 2
+            self._text.configure(state="disabled")
 
         if self._auto_scroll:
             self._text.see("end")
@@ -521,18 +525,29 @@ class LogsPage(tk.Frame):
             self._load_log_file(self._active_tab)
 
     # ─────────────────────────────────────────────────────────────────────────
-    #  Live tab — receives lines from app queue via append_log()
+    #  Live tab — receives lines from app queue via append_logs()
     # ─────────────────────────────────────────────────────────────────────────
     def append_log(self, line: str):
         """
-        Called by app.py queue handler when a sync log line arrives.
-        Always runs on main thread (called from _handle_queue_msg).
+        Append one sync log line to the live tab.
+        Must run on the main thread.
         """
         ts   = datetime.now().strftime("%H:%M:%S")
         full = f"{ts}  {line}"
         tag  = _level_tag(line)
         self._tabs["live"].append_line(full, tag)
 
+    def append_logs(self, lines: list[str]):
+        """
+        Called by app.py queue drain with every sync log line it collected.
+        Always runs on main thread; one Text insert per batch.
+        """
+        ts = datetime.now().strftime("%H:%M:%S")
+        self._tabs["live"].append_lines(
+            [f"{ts}  {line}" for line in lines],
+            [_level_tag(line) for line in lines],
+        )
+
     # ─────────────────────────────────────────────────────────────────────────
     #  Lifecycle
     # ─────────────────────────────────────────────────────────────────────────
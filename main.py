@@ -4,17 +4,7 @@ from services.tally_connector import TallyConnector
 from services.sync_service import sync_all_companies
 from database.db_connector import DatabaseConnector
 from database.database_processor import company_import_db
-from dotenv import load_dotenv
-import os
-
-load_dotenv(".env")
-
-DB_USERNAME = os.getenv('DB_USERNAME', 'root')
-DB_PASSWORD = os.getenv('DB_PASSWORD', 'root')
-DB_HOST     = os.getenv('DB_HOST', 'localhost')
-DB_PORT     = int(os.getenv('DB_PORT', 3306))
-DB_NAME     = os.getenv('DB_NAME', 'tally_db')
-
+from database.config import get_config
 
 
 MANUAL_FROM_DATE = None       # MANUAL_FROM_DATE = '20240401'
@@ -24,12 +14,14 @@ MANUAL_FROM_DATE = None       # MANUAL_FROM_DATE = '20240401'
 def main():
     logger.info("Starting Tally Sync")
 
+    config = get_config()
     db = DatabaseConnector(
-        username = DB_USERNAME,
-        password = DB_PASSWORD,
-        host     = DB_HOST,
-        port     = DB_PORT,
-        database = DB_NAME,
+        username = config.db_username,
+        password = config.db_password,
+        host     = config.db_host,
+        port     = config.db_port,
+        database = config.db_name,
+        echo     = config.sql_echo,
     )
 
     db.create_database_if_not_exists()
@@ -16,6 +16,7 @@ from services.data_processor import (
 )
 from database.database_processor import (
     get_sync_state,
+    get_sync_states,
     update_sync_state,
     upsert_ledgers,
     upsert_items,
@@ -29,6 +30,7 @@ from database.database_processor import (
     upsert_journal_vouchers,
     upsert_contra_vouchers,
     upsert_trial_balance,
+    batch_session,
     INVENTORY_MODEL_MAP,
     LEDGER_MODEL_MAP,
     _upsert_inventory_voucher_in_session,
@@ -193,6 +195,13 @@ def _generate_chunks(from_date_str: str, to_date_str: str, chunk_months: int = S
         chunk_start = date(next_year, next_month, 1)
 
 
+def _load_sync_state(company_name: str, voucher_type: str, engine, states: dict = None):
+    """SyncState from the prefetched *states* of sync_company, else one SELECT."""
+    if states is not None:
+        return states.get(voucher_type)
+    return get_sync_state(company_name, voucher_type, engine)
+
+
 def _mark_chunk_done(company_name: str, voucher_type: str, month_str: str, engine):
     """Persist progress for a chunk that returned no data so we can skip it on restart."""
     lock = _get_company_lock(company_name)
@@ -234,10 +243,11 @@ def _sync_trial_balance(
     engine,
     from_date:    str,
     to_date:      str,
+    states:       dict = None,
 ):
     logger.info(f"[{company_name}] Syncing Trial Balance | {from_date} -> {to_date}")
     try:
-        state          = get_sync_state(company_name, 'trial_balance', engine)
+        state          = _load_sync_state(company_name, 'trial_balance', engine, states)
         saved_alter_id = state.last_alter_id if state else 0
 
         with _TALLY_SEMAPHORE:
@@ -277,7 +287,7 @@ def _sync_trial_balance(
         logger.exception(f"[{company_name}] Trial Balance sync failed")
 
 
-def _sync_items(company_name: str, tally: TallyConnector, engine):
+def _sync_items(company_name: str, tally: TallyConnector, engine, states: dict = None):
     """
     Sync the StockItem master for *company_name*.
 
@@ -287,7 +297,7 @@ def _sync_items(company_name: str, tally: TallyConnector, engine):
     logger.info(f"[{company_name}] Syncing Items (StockItem master)")
     lock = _get_company_lock(company_name)
     try:
-        state           = get_sync_state(company_name, 'items', engine)
+        state           = _load_sync_state(company_name, 'items', engine, states)
         is_initial_done = state.is_initial_done if state else False
         last_alter_id   = state.last_alter_id   if state else 0
 
@@ -343,11 +353,11 @@ def _sync_items(company_name: str, tally: TallyConnector, engine):
         logger.exception(f"[{company_name}] Item sync failed")
 
 
-def _sync_ledgers(company_name: str, tally: TallyConnector, engine):
+def _sync_ledgers(company_name: str, tally: TallyConnector, engine, states: dict = None):
     logger.info(f"[{company_name}] Syncing Ledgers")
     lock = _get_company_lock(company_name)
     try:
-        state           = get_sync_state(company_name, 'ledger', engine)
+        state           = _load_sync_state(company_name, 'ledger', engine, states)
         is_initial_done = state.is_initial_done if state else False
         last_alter_id   = state.last_alter_id   if state else 0
 
@@ -410,6 +420,7 @@ def _sync_voucher(
     engine,
     from_date:    str,
     to_date:      str,
+    states:       dict = None,
 ):
     voucher_type     = config['voucher_type']
     snapshot_fetch   = config['snapshot_fetch']
@@ -423,7 +434,7 @@ def _sync_voucher(
     logger.info(f"[{company_name}][{voucher_type}] Starting")
 
     try:
-        state             = get_sync_state(company_name, voucher_type, engine)
+        state             = _load_sync_state(company_name, voucher_type, engine, states)
         is_initial_done   = state.is_initial_done   if state else False
         last_alter_id     = state.last_alter_id     if state else 0
         last_synced_month = state.last_synced_month if state else None
@@ -452,13 +463,16 @@ def _sync_voucher(
                 )
                 return
 
-            t1 = datetime.now()
-            upsert(rows, engine)
-            upsert_ms = int((datetime.now() - t1).total_seconds() * 1000)
-
+            # Voucher rows and SyncState commit together in one transaction,
+            # and the commit happens under the company lock.
             new_max = _get_max_alter_id(rows)
-            with lock:
-                update_sync_state(company_name, voucher_type, new_max, engine, is_initial_done=True)
+            with batch_session(engine) as db:
+                t1 = datetime.now()
+                upsert(rows, engine, db=db)
+                upsert_ms = int((datetime.now() - t1).total_seconds() * 1000)
+
+                with lock:
+                    update_sync_state(company_name, voucher_type, new_max, engine, is_initial_done=True, db=db)
             logger.info(
                 f"[{company_name}][{voucher_type}] CDC done | "
                 f"rows={len(rows)} | new max_alter_id={new_max} | "
@@ -594,10 +608,14 @@ def sync_company(
 
     start_time = datetime.now()
 
+    # One SELECT for every entity's sync state.  Each entity only reads its
+    # own row once, before it writes it, so the snapshot never goes stale.
+    states = get_sync_states(comp_name, engine)
+
     # Ledgers, items and trial balance are sequential (fast master syncs)
-    _sync_ledgers(comp_name, tally, engine)
-    _sync_items(comp_name, tally, engine)
-    _sync_trial_balance(comp_name, tally, engine, from_date, to_date)
+    _sync_ledgers(comp_name, tally, engine, states)
+    _sync_items(comp_name, tally, engine, states)
+    _sync_trial_balance(comp_name, tally, engine, from_date, to_date, states)
 
     logger.info(f"[{comp_name}] Launching {len(VOUCHER_CONFIG)} voucher syncs …")
     with ThreadPoolExecutor(max_workers=inner_workers) as executor:
@@ -610,6 +628,7 @@ def sync_company(
                 engine       = engine,
                 from_date    = from_date,
                 to_date      = to_date,
+                states       = states,
             ): config['voucher_type']
             for config in VOUCHER_CONFIG
         }